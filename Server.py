@@ -1,12 +1,40 @@
 import socket
-import threading
+import selectors
+import asyncio
+import multiprocessing
 import logging
+import logging.handlers
+import queue
 import configparser
+import functools
 import os
 import signal
-import sys
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# uvloop is an optional, faster drop-in asyncio event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def _available_cpus():
+    """
+    Get the CPU cores this process may run on.
+    
+    Returns:
+        list: Sorted core numbers from the affinity mask, or every core where
+        the platform has no affinity API
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+# Cores available to the server, inherited by the worker processes
+CPUS = _available_cpus()
+
 # Load configuration
 config = configparser.ConfigParser()
 config.read('server_config.ini')
@@ -14,26 +42,157 @@ config.read('server_config.ini')
 HOST = config.get('SERVER', 'HOST', fallback='0.0.0.0')
 PORT = int(config.get('SERVER', 'PORT', fallback='12345'))
 MAX_CONNECTIONS = int(config.get('SERVER', 'MAX_CONNECTIONS', fallback='5'))
-BUFFER_SIZE = int(config.get('SERVER', 'BUFFER_SIZE', fallback='1024'))
+BUFFER_SIZE = int(config.get('SERVER', 'BUFFER_SIZE', fallback='65536'))
+# Number of SO_REUSEPORT worker processes; 0 means one per available CPU core
+WORKERS = int(config.get('SERVER', 'WORKERS', fallback='0')) or len(CPUS)
+# Event loop serving the clients: 'reactor' (selectors) or 'asyncio'
+BACKEND = config.get('SERVER', 'BACKEND', fallback='reactor').lower()
+# Per-message receive records logged per second; 0 logs every message
+RECEIVE_LOG_RATE = int(config.get('LOGGING', 'RECEIVE_LOG_RATE', fallback='100'))
+
+logger = logging.getLogger(__name__)
 
-# Set up logging
-logging.basicConfig(
-    filename='server.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+# One formatter shared by every handler
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-# Also log to console
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logging.getLogger().addHandler(console_handler)
+# Queue handler currently installed on the root logger by setup_logging()
+_queue_handler = None
+
+def setup_logging():
+    """
+    Set up logging so that file and console output happen on a listener thread.
+    Callers only enqueue records; file writes are additionally batched.
+    
+    Returns:
+        logging.handlers.QueueListener: Started listener that owns the real handlers
+    """
+    global _queue_handler
+    
+    file_handler = logging.FileHandler('server.log')
+    file_handler.setFormatter(_FORMATTER)
+    # Write the file in batches; errors are written out immediately
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    
+    handlers = [buffered_file_handler]
+    
+    # Also log to console unless disabled with PS_CONSOLE=0
+    if os.environ.get('PS_CONSOLE', '1') == '1':
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(_FORMATTER)
+        handlers.append(console_handler)
+    
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    
+    root_logger = logging.getLogger()
+    if _queue_handler is not None:
+        root_logger.removeHandler(_queue_handler)
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    root_logger.setLevel(logging.INFO)
+    
+    listener.start()
+    return listener
+
+def stop_logging(listener):
+    """
+    Stop a logging listener and flush everything its handlers still buffer.
+    
+    Args:
+        listener: Listener returned by setup_logging()
+    """
+    global _queue_handler
+    
+    # Records logged afterwards would pile up in a queue nobody drains
+    if _queue_handler is not None and _queue_handler.queue is listener.queue:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    listener.stop()
+    for handler in listener.handlers:
+        # MemoryHandler.close() flushes but leaves its target open
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
 
 # Global variable to control server shutdown
 server_running = True
 
+# Bounded pool running handle_client in the thread-per-connection fallback
+_client_pool = None
+
+# Multiplex all clients on one epoll-backed reactor where available; other
+# platforms fall back to one thread per client.
+USE_REACTOR = hasattr(selectors, 'EpollSelector')
+
+# Let the kernel spread accepts over one listener per worker process
+USE_REUSEPORT = USE_REACTOR and hasattr(socket, 'SO_REUSEPORT')
+
+# How often (in seconds) blocking loops wake up to check server_running
+POLL_INTERVAL = 1.0
+
+# Every message is prefixed with its length as a 4-byte big-endian integer
+MESSAGE_HEADER = struct.Struct('>I')
+# Messages announcing a larger body are treated as a protocol error
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+# Initial size of each reactor connection's reusable receive buffer
+RECV_BUFFER_SIZE = max(BUFFER_SIZE, 64 * 1024)
+
+# Stop reading from a reactor client once this many acknowledgment bytes are
+# queued for it, and resume when fewer than SEND_LOW_WATER remain
+SEND_HIGH_WATER = 4 * 1024 * 1024
+SEND_LOW_WATER = 1024 * 1024
+
+# Kernel send/receive buffer size requested for every socket
+SOCKET_BUFFER_SIZE = 1 << 20
+
+# Acknowledgments echo the raw message bytes after this prefix
+ACK_PREFIX = b"Server received: "
+
+def _rearm_quickack(client_socket):
+    """
+    Ask the kernel to acknowledge incoming data immediately.
+    Linux clears TCP_QUICKACK after some reads, so it is re-armed after each recv.
+    
+    Args:
+        client_socket: Connected TCP socket
+    """
+    if hasattr(socket, 'TCP_QUICKACK'):
+        try:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except OSError:
+            pass
+
+def _tune_client_socket(client_socket):
+    """
+    Disable Nagle's algorithm and delayed ACKs on an accepted connection
+    and enlarge its kernel buffers.
+    
+    Args:
+        client_socket: Connected TCP socket
+    """
+    try:
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        logger.debug("Could not set TCP_NODELAY: %s", e)
+    try:
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    except OSError as e:
+        logger.debug("Could not set socket buffer sizes: %s", e)
+    _rearm_quickack(client_socket)
+
 def signal_handler(sig, frame):
     """
     Handle shutdown signals gracefully.
@@ -43,108 +202,809 @@ def signal_handler(sig, frame):
         frame: Current stack frame
     """
     global server_running
-    logging.info("Shutdown signal received. Stopping server...")
+    logger.info("Shutdown signal received. Stopping server...")
     server_running = False
-    sys.exit(0)
+    if _client_pool is not None:
+        _client_pool.shutdown(wait=False, cancel_futures=True)
+
+def _serving(stop_event=None):
+    """
+    Check whether a serving loop should keep going.
+    
+    Args:
+        stop_event: Optional Event that stops this loop when set
+        
+    Returns:
+        bool: True until the server shuts down or stop_event is set
+    """
+    return server_running and not (stop_event and stop_event.is_set())
+
+# One-second window of the receive log rate limiter. Updated without a lock:
+# a race between handler threads only miscounts a record or two.
+_receive_log_window = 0.0
+_receive_log_count = 0
+_receive_log_dropped = 0
+
+def _receive_log_allowed():
+    """
+    Apply RECEIVE_LOG_RATE to the per-message receive log. When a window ends,
+    the number of records it suppressed is logged once.
+    
+    Returns:
+        bool: True if this message may be logged
+    """
+    global _receive_log_window, _receive_log_count, _receive_log_dropped
+    
+    if not RECEIVE_LOG_RATE:
+        return True
+    now = time.monotonic()
+    if now - _receive_log_window >= 1.0:
+        if _receive_log_dropped:
+            logger.info("Suppressed %s receive log records", _receive_log_dropped)
+        _receive_log_window = now
+        _receive_log_count = 0
+        _receive_log_dropped = 0
+    if _receive_log_count < RECEIVE_LOG_RATE:
+        _receive_log_count += 1
+        return True
+    _receive_log_dropped += 1
+    return False
+
+def _log_received(client_address, data):
+    """
+    Log a received message, decoding it only if INFO records are emitted and
+    the receive log rate limit allows it.
+    
+    Args:
+        client_address: Tuple containing client IP and port
+        data: Raw message bytes
+    """
+    if logger.isEnabledFor(logging.INFO) and _receive_log_allowed():
+        client_ip, client_port = client_address
+        message = bytes(data).decode('utf-8', errors='replace')
+        logger.info("Received from %s:%s: %s", client_ip, client_port, message)
 
-def handle_client(client_socket, client_address):
+def _recv_exact(client_socket, view, stop_event=None):
+    """
+    Fill a buffer completely from a blocking socket.
+    
+    Args:
+        client_socket: Socket object for the client connection
+        view (memoryview): Writable buffer to receive into
+        stop_event: Optional Event that stops waiting when set
+        
+    Returns:
+        bool: True if the buffer was filled, False if the client disconnected first
+    """
+    received = 0
+    size = len(view)
+    while received < size:
+        try:
+            count = client_socket.recv_into(view[received:])
+        except socket.timeout:
+            # Sockets with a timeout wake up periodically to check for shutdown
+            if _serving(stop_event):
+                continue
+            return False
+        _rearm_quickack(client_socket)
+        if not count:
+            return False
+        received += count
+    return True
+
+def _recv_large(client_socket, length, initial_size, stop_event=None):
+    """
+    Receive a message body larger than the reusable buffer, growing a one-off
+    buffer as data arrives instead of allocating the announced length up front.
+    
+    Args:
+        client_socket: Socket object for the client connection
+        length (int): Announced body length
+        initial_size (int): Size of the first chunk to receive
+        stop_event: Optional Event that stops waiting when set
+        
+    Returns:
+        bytearray or None: Received body, or None if the client disconnected first
+    """
+    body = bytearray(min(initial_size, length))
+    received = 0
+    while True:
+        with memoryview(body) as view:
+            if not _recv_exact(client_socket, view[received:], stop_event):
+                return None
+        received = len(body)
+        if received == length:
+            return body
+        # Double the buffer, up to the announced length
+        body.extend(bytearray(min(received, length - received)))
+
+def _sendmsg_all(client_socket, buffers):
+    """
+    Write all buffers with scatter-gather sendmsg() calls, without joining them.
+    
+    Args:
+        client_socket: Socket object for the client connection
+        buffers (list): Bytes-like objects to send, in order
+    """
+    if not hasattr(client_socket, 'sendmsg'):
+        # Windows has no sendmsg(); fall back to one joined write
+        client_socket.sendall(b"".join(buffers))
+        return
+    
+    views = [memoryview(buffer) for buffer in buffers]
+    remaining = sum(len(view) for view in views)
+    while True:
+        sent = client_socket.sendmsg(views)
+        remaining -= sent
+        if remaining <= 0:
+            return
+        # Skip past everything the kernel accepted
+        index = 0
+        while sent >= len(views[index]):
+            sent -= len(views[index])
+            index += 1
+        views = [views[index][sent:]] + views[index + 1:]
+
+def handle_client(client_socket, client_address, stop_event=None):
     """
     Handle individual client connections.
     
     Args:
         client_socket: Socket object for the client connection
-        client_address: Tuple containing client IP and port
+        client_address: Tuple containing client IP and port, or None to look it up
+        stop_event: Optional Event that stops this handler when set
     """
-    client_ip, client_port = client_address
-    logging.info(f"New client connected: {client_ip}:{client_port}")
+    # Resolved once per connection and reused for every log line
+    peer = client_address if client_address else client_socket.getpeername()
+    client_ip, client_port = peer
+    logger.info("New client connected: %s:%s", client_ip, client_port)
+    
+    # Reused for every message on this connection
+    buffer = bytearray(max(BUFFER_SIZE, MESSAGE_HEADER.size))
+    view = memoryview(buffer)
     
     try:
-        while server_running:
-            # Receive data from client
-            data = client_socket.recv(BUFFER_SIZE)
-            if not data:
-                logging.info(f"Client {client_ip}:{client_port} disconnected")
+        while _serving(stop_event):
+            # Receive the length header, then the message body
+            if not _recv_exact(client_socket, view[:MESSAGE_HEADER.size], stop_event):
+                logger.info("Client %s:%s disconnected", client_ip, client_port)
+                break
+            
+            (length,) = MESSAGE_HEADER.unpack_from(buffer)
+            if length > MAX_MESSAGE_SIZE:
+                logger.error("Message of %s bytes from %s:%s exceeds limit", length, client_ip, client_port)
+                break
+            
+            # Messages larger than the reusable buffer get a one-off buffer
+            if length <= len(buffer):
+                data = view[:length]
+                if not _recv_exact(client_socket, data, stop_event):
+                    data = None
+            else:
+                data = _recv_large(client_socket, length, len(buffer) * 2, stop_event)
+            if data is None:
+                logger.info("Client %s:%s disconnected", client_ip, client_port)
                 break
                 
-            # Decode and log received data
-            message = data.decode('utf-8')
-            logging.info(f"Received from {client_ip}:{client_port}: {message}")
+            _log_received(peer, data)
             
             # Optional: Send acknowledgment back to client
             try:
-                ack_message = f"Server received: {message}"
-                client_socket.sendall(ack_message.encode('utf-8'))
-                logging.debug(f"Sent acknowledgment to {client_ip}:{client_port}")
+                _sendmsg_all(client_socket, [ACK_PREFIX, data])
+                logger.debug("Sent acknowledgment to %s:%s", client_ip, client_port)
             except Exception as e:
-                logging.error(f"Failed to send acknowledgment to {client_ip}:{client_port}: {e}")
+                logger.error("Failed to send acknowledgment to %s:%s: %s", client_ip, client_port, e)
+                break
                 
     except socket.error as e:
-        logging.error(f"Socket error with client {client_ip}:{client_port}: {e}")
+        logger.error("Socket error with client %s:%s: %s", client_ip, client_port, e)
     except Exception as e:
-        logging.error(f"Unexpected error with client {client_ip}:{client_port}: {e}")
+        logger.error("Unexpected error with client %s:%s: %s", client_ip, client_port, e)
     finally:
         try:
             client_socket.close()
-            logging.info(f"Closed connection to {client_ip}:{client_port}")
+            logger.info("Closed connection to %s:%s", client_ip, client_port)
         except Exception as e:
-            logging.error(f"Error closing connection to {client_ip}:{client_port}: {e}")
+            logger.error("Error closing connection to %s:%s: %s", client_ip, client_port, e)
 
-def start_server():
+def handle_file_request(client_socket, path):
     """
-    Start the server and listen for client connections.
-    """
-    global server_running
+    Send a file's contents to a client with sendfile(), without copying it
+    through user space. Platforms without sendfile() fall back to send().
     
-    # Set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    Only for blocking sockets such as those of the threaded backend: a
+    reactor client would stall every other client on its thread, and the
+    file could overtake acknowledgments still queued for it.
     
-    # Create server socket
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    Args:
+        client_socket: Blocking socket object for the client connection
+        path (str): Path of the file to send
+        
+    Returns:
+        int or None: Number of bytes sent, None if the file could not be sent
+        
+    Raises:
+        ValueError: If client_socket is non-blocking
+    """
+    if client_socket.gettimeout() == 0:
+        raise ValueError("handle_file_request() requires a blocking socket")
+    try:
+        with open(path, 'rb') as f:
+            sent = client_socket.sendfile(f)
+        logger.debug("Sent %s bytes from %s", sent, path)
+        return sent
+    except OSError as e:
+        logger.error("Failed to send file %s: %s", path, e)
+        return None
+
+def _close_client(sel, client_socket, state):
+    """
+    Unregister a reactor-managed client and close its socket.
     
+    Args:
+        sel: Selector the client is registered with
+        client_socket: Socket object for the client connection
+        state: Per-connection state dictionary
+    """
+    client_ip, client_port = state['client_address']
     try:
-        # Set socket options for better performance
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sel.unregister(client_socket)
+    except (KeyError, ValueError):
+        pass
+    try:
+        client_socket.close()
+        logger.info("Closed connection to %s:%s", client_ip, client_port)
+    except Exception as e:
+        logger.error("Error closing connection to %s:%s: %s", client_ip, client_port, e)
+
+def _new_connection_state(client_address):
+    """
+    Create the state the reactor keeps for one client connection.
+    
+    Args:
+        client_address: Tuple containing client IP and port
         
-        # Bind to host and port
-        server.bind((HOST, PORT))
-        server.listen(MAX_CONNECTIONS)
+    Returns:
+        dict: Per-connection state stored with the selector registration
+    """
+    return {
+        'client_address': client_address,
+        'recv_buffer': bytearray(RECV_BUFFER_SIZE),
+        'recv_length': 0,
+        'send_buffer': bytearray(),
+        # Set once the client has half-closed; the socket closes when send_buffer drains
+        'closing': False
+    }
+
+def _on_accept(sel, server):
+    """
+    Accept every pending connection on the listening socket.
+    
+    Args:
+        sel: Selector to register the new clients with
+        server: Non-blocking listening socket
+    """
+    while True:
+        try:
+            client_socket, client_address = server.accept()
+        except BlockingIOError:
+            return
+        except socket.error as e:
+            if server_running:
+                logger.error("Error accepting connection: %s", e)
+            return
         
-        logging.info(f"Server started successfully on {HOST}:{PORT}")
-        logging.info(f"Maximum connections: {MAX_CONNECTIONS}")
-        logging.info(f"Buffer size: {BUFFER_SIZE} bytes")
-        logging.info("Waiting for client connections...")
+        client_socket.setblocking(False)
+        _tune_client_socket(client_socket)
+        sel.register(client_socket, selectors.EVENT_READ, _new_connection_state(client_address))
         
-        while server_running:
+        client_ip, client_port = client_address
+        logger.info("New client connected: %s:%s", client_ip, client_port)
+
+def _set_events(sel, client_socket, state, events):
+    """
+    Change the events a client is registered for, skipping no-op updates.
+    
+    Args:
+        sel: Selector the client is registered with
+        client_socket: Registered client socket
+        state: Connection state stored with the registration
+        events: New selectors event mask
+    """
+    if sel.get_key(client_socket).events != events:
+        sel.modify(client_socket, events, state)
+
+def _on_read(sel, key):
+    """
+    Read available data from a client and queue its acknowledgment.
+    
+    Args:
+        sel: Selector the client is registered with
+        key: Selector key of the readable client
+        
+    Returns:
+        bool: True if the connection is still open, False otherwise
+    """
+    client_socket = key.fileobj
+    state = key.data
+    client_ip, client_port = state['client_address']
+    recv_buffer = state['recv_buffer']
+    recv_length = state['recv_length']
+    send_buffer = state['send_buffer']
+    
+    try:
+        # Read straight into the free tail of the connection's buffer
+        with memoryview(recv_buffer) as view:
+            received = client_socket.recv_into(view[recv_length:])
+        _rearm_quickack(client_socket)
+    except (BlockingIOError, InterruptedError):
+        return True
+    except socket.error as e:
+        logger.error("Socket error with client %s:%s: %s", client_ip, client_port, e)
+        _close_client(sel, client_socket, state)
+        return False
+    
+    if not received:
+        logger.info("Client %s:%s disconnected", client_ip, client_port)
+        if send_buffer:
+            # Deliver the acknowledgments still queued before closing
+            state['closing'] = True
+            _set_events(sel, client_socket, state, selectors.EVENT_WRITE)
+            return True
+        _close_client(sel, client_socket, state)
+        return False
+    recv_length += received
+    
+    # Acknowledge every complete message; keep a trailing partial one buffered
+    offset = 0
+    with memoryview(recv_buffer) as view:
+        while recv_length - offset >= MESSAGE_HEADER.size:
+            (length,) = MESSAGE_HEADER.unpack_from(view, offset)
+            if length > MAX_MESSAGE_SIZE:
+                logger.error("Message of %s bytes from %s:%s exceeds limit", length, client_ip, client_port)
+                _close_client(sel, client_socket, state)
+                return False
+            
+            end = offset + MESSAGE_HEADER.size + length
+            if recv_length < end:
+                break
+            
+            body = view[offset + MESSAGE_HEADER.size:end]
+            _log_received(state['client_address'], body)
+            send_buffer += ACK_PREFIX
+            send_buffer += body
+            body.release()
+            offset = end
+    
+    # Move the partial message to the front of the buffer
+    if offset:
+        recv_length -= offset
+        recv_buffer[:recv_length] = recv_buffer[offset:offset + recv_length]
+    
+    # Grow a full buffer as a large message arrives, doubling it up to the
+    # message size, and shrink it back afterwards
+    if recv_length == len(recv_buffer):
+        (length,) = MESSAGE_HEADER.unpack_from(recv_buffer, 0)
+        needed = MESSAGE_HEADER.size + length
+        recv_buffer.extend(bytearray(min(len(recv_buffer), needed - len(recv_buffer))))
+    elif recv_length < MESSAGE_HEADER.size and len(recv_buffer) > RECV_BUFFER_SIZE:
+        del recv_buffer[RECV_BUFFER_SIZE:]
+    state['recv_length'] = recv_length
+    
+    if len(send_buffer) >= SEND_HIGH_WATER:
+        # The client is not reading its acknowledgments; stop reading from it
+        _set_events(sel, client_socket, state, selectors.EVENT_WRITE)
+    elif send_buffer:
+        # Flushed once the socket is writable
+        _set_events(sel, client_socket, state, selectors.EVENT_READ | selectors.EVENT_WRITE)
+    return True
+
+def _on_write(sel, key):
+    """
+    Flush as much of a client's pending acknowledgments as the socket accepts.
+    
+    Args:
+        sel: Selector the client is registered with
+        key: Selector key of the writable client
+    """
+    client_socket = key.fileobj
+    state = key.data
+    client_ip, client_port = state['client_address']
+    send_buffer = state['send_buffer']
+    
+    try:
+        sent = client_socket.send(send_buffer)
+    except (BlockingIOError, InterruptedError):
+        return
+    except socket.error as e:
+        logger.error("Failed to send acknowledgment to %s:%s: %s", client_ip, client_port, e)
+        _close_client(sel, client_socket, state)
+        return
+    
+    del send_buffer[:sent]
+    if state['closing']:
+        if not send_buffer:
+            _close_client(sel, client_socket, state)
+    elif not send_buffer:
+        _set_events(sel, client_socket, state, selectors.EVENT_READ)
+        logger.debug("Sent acknowledgment to %s:%s", client_ip, client_port)
+    elif len(send_buffer) < SEND_LOW_WATER:
+        # Resume reading once the backlog has drained
+        _set_events(sel, client_socket, state, selectors.EVENT_READ | selectors.EVENT_WRITE)
+
+def run_reactor(server, stop_event=None):
+    """
+    Serve all clients from a single selector-driven event loop.
+    
+    Args:
+        server: Bound and listening server socket
+        stop_event: Optional multiprocessing.Event that stops the loop when set
+    """
+    sel = selectors.DefaultSelector()
+    server.setblocking(False)
+    sel.register(server, selectors.EVENT_READ, None)
+    
+    try:
+        while _serving(stop_event):
+            for key, mask in sel.select(timeout=POLL_INTERVAL):
+                if key.data is None:
+                    _on_accept(sel, server)
+                    continue
+                
+                if mask & selectors.EVENT_READ and not _on_read(sel, key):
+                    continue
+                if mask & selectors.EVENT_WRITE:
+                    _on_write(sel, key)
+    finally:
+        for key in list(sel.get_map().values()):
+            if key.data is not None:
+                _close_client(sel, key.fileobj, key.data)
+        sel.close()
+
+async def handle_client_async(reader, writer, stop_event=None):
+    """
+    Handle an individual client connection as an asyncio coroutine.
+    
+    Args:
+        reader: asyncio.StreamReader of the client connection
+        writer: asyncio.StreamWriter of the client connection
+        stop_event: Optional Event that stops this handler when set
+    """
+    client_address = writer.get_extra_info('peername')[:2]
+    client_ip, client_port = client_address
+    logger.info("New client connected: %s:%s", client_ip, client_port)
+    
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        _tune_client_socket(sock)
+    
+    try:
+        while _serving(stop_event):
+            # Receive the length header, then the message body
+            header = await reader.readexactly(MESSAGE_HEADER.size)
+            (length,) = MESSAGE_HEADER.unpack(header)
+            if length > MAX_MESSAGE_SIZE:
+                logger.error("Message of %s bytes from %s:%s exceeds limit", length, client_ip, client_port)
+                break
+            
+            data = await reader.readexactly(length)
+            _log_received(client_address, data)
+            
+            writer.writelines((ACK_PREFIX, data))
+            await writer.drain()
+            
+    except asyncio.IncompleteReadError:
+        logger.info("Client %s:%s disconnected", client_ip, client_port)
+    except (ConnectionError, OSError) as e:
+        logger.error("Socket error with client %s:%s: %s", client_ip, client_port, e)
+    except Exception as e:
+        logger.error("Unexpected error with client %s:%s: %s", client_ip, client_port, e)
+    finally:
+        try:
+            writer.close()
+            await writer.wait_closed()
+            logger.info("Closed connection to %s:%s", client_ip, client_port)
+        except Exception as e:
+            logger.error("Error closing connection to %s:%s: %s", client_ip, client_port, e)
+
+async def _serve_async(server, stop_event=None):
+    """
+    Accept clients on an existing listening socket until shutdown.
+    
+    Args:
+        server: Bound and listening server socket
+        stop_event: Optional multiprocessing.Event that stops the server when set
+    """
+    handlers = set()
+    
+    async def handle(reader, writer):
+        task = asyncio.current_task()
+        handlers.add(task)
+        try:
+            await handle_client_async(reader, writer, stop_event)
+        except asyncio.CancelledError:
+            # Cancelled on shutdown after closing its connection
+            pass
+        finally:
+            handlers.discard(task)
+    
+    async_server = await asyncio.start_server(handle, sock=server)
+    async with async_server:
+        while _serving(stop_event):
+            await asyncio.sleep(POLL_INTERVAL)
+        
+        # Idle handlers wait in readexactly(), and leaving the block waits for
+        # every connection on Python 3.12+; stop them first
+        async_server.close()
+        for task in list(handlers):
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+def run_asyncio(server, stop_event=None):
+    """
+    Serve all clients from an asyncio event loop, using uvloop when installed.
+    
+    Args:
+        server: Bound and listening server socket
+        stop_event: Optional multiprocessing.Event that stops the loop when set
+    """
+    # A private loop leaves the process-wide event loop policy untouched
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_serve_async(server, stop_event))
+    finally:
+        # Cancel handlers of clients that are still connected, as asyncio.run() would
+        tasks = asyncio.all_tasks(loop)
+        if tasks:
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+def _close_if_cancelled(client_socket, future):
+    """
+    Close the socket of a queued client whose handler was cancelled before it ran.
+    
+    Args:
+        client_socket: Socket object for the client connection
+        future: Future of the handle_client call
+    """
+    if future.cancelled():
+        client_socket.close()
+
+def run_threaded(server, stop_event=None):
+    """
+    Serve clients from a bounded pool of worker threads.
+    Used on platforms without an epoll-backed selector.
+    
+    Args:
+        server: Bound and listening server socket
+        stop_event: Optional Event that stops the loop and its handlers when set
+    """
+    global _client_pool
+    
+    server.settimeout(POLL_INTERVAL)
+    _client_pool = ThreadPoolExecutor(
+        max_workers=MAX_CONNECTIONS * 4,
+        thread_name_prefix='ps-worker'
+    )
+    
+    try:
+        while _serving(stop_event):
             try:
                 # Accept client connection
                 client_socket, client_address = server.accept()
+                if not _serving(stop_event):
+                    client_socket.close()
+                    break
+                # Handlers wake up periodically to notice shutdown
+                client_socket.settimeout(POLL_INTERVAL)
+                _tune_client_socket(client_socket)
                 
-                # Create thread for client handling
-                client_handler = threading.Thread(
-                    target=handle_client,
-                    args=(client_socket, client_address),
-                    daemon=True
-                )
-                client_handler.start()
+                # Queue the client for the next free worker thread
+                try:
+                    future = _client_pool.submit(handle_client, client_socket, client_address, stop_event)
+                except RuntimeError:
+                    # signal_handler already shut the pool down
+                    client_socket.close()
+                    break
+                # Shutdown cancels queued handlers, which then never close their socket
+                future.add_done_callback(functools.partial(_close_if_cancelled, client_socket))
                 
+            except socket.timeout:
+                continue
             except socket.error as e:
                 if server_running:
-                    logging.error(f"Error accepting connection: {e}")
+                    logger.error("Error accepting connection: %s", e)
                 break
+    finally:
+        _client_pool.shutdown(wait=False, cancel_futures=True)
+
+def serve(server, stop_event=None):
+    """
+    Serve clients on a listening socket with the configured backend.
+    
+    Args:
+        server: Bound and listening server socket
+        stop_event: Optional multiprocessing.Event that stops serving when set
+    """
+    if BACKEND == 'asyncio':
+        run_asyncio(server, stop_event)
+    elif USE_REACTOR:
+        run_reactor(server, stop_event)
+    else:
+        run_threaded(server, stop_event)
+
+def create_server_socket(reuse_port=False):
+    """
+    Create a listening socket bound to the configured host and port.
+    
+    Args:
+        reuse_port (bool): Set SO_REUSEPORT so several listeners can share the port
+        
+    Returns:
+        socket.socket: Bound and listening server socket
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        # Set socket options for better performance
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Set before listen() so accepted sockets advertise a large TCP window
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        
+        # Bind to host and port
+        server.bind((HOST, PORT))
+        server.listen(MAX_CONNECTIONS)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+def _worker_main(index, stop_event):
+    """
+    Entry point of a SO_REUSEPORT worker process.
+    
+    Args:
+        index (int): Worker number, also selects the available CPU core to pin to
+        stop_event: multiprocessing.Event set by the parent on shutdown
+    """
+    # The parent process owns shutdown and signals it through stop_event;
+    # SIGTERM keeps its default action so the parent can terminate() a stuck worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    # A forked worker does not inherit the parent's listener thread
+    listener = setup_logging()
+    try:
+        _serve_worker(index, stop_event)
+    finally:
+        stop_logging(listener)
+
+def _serve_worker(index, stop_event):
+    """
+    Run the reactor of a SO_REUSEPORT worker process.
+    
+    Args:
+        index (int): Worker number, also selects the available CPU core to pin to
+        stop_event: multiprocessing.Event set by the parent on shutdown
+    """
+    # Keep accept and recv on the core the NIC steers this worker's packets to
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {CPUS[index % len(CPUS)]})
+        except OSError as e:
+            logger.warning("Worker %s could not set CPU affinity: %s", index, e)
+    
+    try:
+        server = create_server_socket(reuse_port=True)
+    except Exception as e:
+        logger.error("Worker %s failed to start: %s", index, e)
+        return
+    
+    logger.info("Worker %s (pid %s) accepting connections", index, os.getpid())
+    try:
+        serve(server, stop_event)
+    except Exception as e:
+        logger.error("Worker %s error: %s", index, e)
+    finally:
+        server.close()
+
+def run_workers(worker_count):
+    """
+    Serve clients from several reactor processes sharing the port via SO_REUSEPORT.
+    
+    Args:
+        worker_count (int): Number of worker processes to start
+    """
+    stop_event = multiprocessing.Event()
+    workers = []
+    for index in range(worker_count):
+        worker = multiprocessing.Process(
+            target=_worker_main,
+            args=(index, stop_event),
+            name=f"PhantomStrike-Worker-{index}",
+            daemon=True
+        )
+        worker.start()
+        workers.append(worker)
+    
+    # Start the listener thread only now, so no worker is forked with it running
+    listener = setup_logging()
+    logger.info("Server starting on %s:%s with %s workers", HOST, PORT, worker_count)
+    logger.info("Maximum connections: %s", MAX_CONNECTIONS)
+    logger.info("Buffer size: %s bytes", BUFFER_SIZE)
+    
+    try:
+        while server_running and any(worker.is_alive() for worker in workers):
+            stop_event.wait(POLL_INTERVAL)
+    except Exception as e:
+        logger.error("Server error: %s", e)
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=POLL_INTERVAL * 2)
+            if worker.is_alive():
+                logger.warning("Worker %s did not stop, terminating it", worker.name)
+                worker.terminate()
+                worker.join(timeout=POLL_INTERVAL)
+            if worker.is_alive():
+                worker.kill()
+                worker.join(timeout=POLL_INTERVAL)
+        
+        alive = [worker.name for worker in workers if worker.is_alive()]
+        if alive:
+            logger.error("Workers still running: %s", ", ".join(alive))
+        else:
+            logger.info("All workers stopped")
+        stop_logging(listener)
+
+def start_server():
+    """
+    Start the server and listen for client connections.
+    """
+    # Set up signal handlers for graceful shutdown
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    if USE_REUSEPORT and WORKERS > 1:
+        # Sets up logging itself once the workers are forked
+        run_workers(WORKERS)
+        return
+    
+    listener = setup_logging()
+    logger.info("Maximum connections: %s", MAX_CONNECTIONS)
+    logger.info("Buffer size: %s bytes", BUFFER_SIZE)
+    
+    try:
+        # Create server socket
+        server = create_server_socket()
+    except Exception as e:
+        logger.error("Server error: %s", e)
+        stop_logging(listener)
+        return
+    
+    try:
+        logger.info("Server started successfully on %s:%s", HOST, PORT)
+        logger.info("Waiting for client connections...")
+        
+        serve(server)
                 
     except Exception as e:
-        logging.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
     finally:
         try:
             server.close()
-            logging.info("Server socket closed")
+            logger.info("Server socket closed")
         except Exception as e:
-            logging.error(f"Error closing server socket: {e}")
+            logger.error("Error closing server socket: %s", e)
+        stop_logging(listener)
 
 if __name__ == "__main__":
     # Check if config file exists
     if not os.path.exists('server_config.ini'):
-        logging.warning("Configuration file 'server_config.ini' not found. Using default values.")
+        logger.warning("Configuration file 'server_config.ini' not found. Using default values.")
     
     start_server()
\ No newline at end of file
@@ -7,14 +7,59 @@ import os
 import sys
 import logging
 import configparser
+import functools
+import json
 import platform
-import time
 from datetime import datetime
 
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from functions.config_loader import load_config, resolve_config_path
 from functions.data_sender import DataSender
+from functions.logging_setup import setup_logging
+
+# Pre-encoded prefix of every system information message
+_SYSINFO_PREFIX = b"System Info: "
+
+def _json_dumps(obj):
+    """
+    Serialize an object to compact JSON, using orjson when it is installed.
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+@functools.lru_cache(maxsize=None)
+def _static_system_info():
+    """
+    Collect the system information that stays constant for the process lifetime.
+    The result is cached after the first successful call.
+    
+    Returns:
+        dict: Static system information dictionary
+    """
+    return {
+        'platform': platform.platform(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'version': platform.version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python_version': platform.python_version()
+    }
 
 class PhantomStrikeClient:
     """
@@ -41,20 +86,20 @@ class PhantomStrikeClient:
         Returns:
             configparser.ConfigParser: Configuration object
         """
-        config = configparser.ConfigParser()
-        config_path = os.path.join(os.path.dirname(__file__), '..', self.config_file)
+        config_path = resolve_config_path(self.config_file)
         
-        if not os.path.exists(config_path):
-            logging.warning(f"Configuration file '{config_path}' not found. Using default values.")
-            return self._get_default_config()
-            
         try:
-            config.read(config_path)
-            logging.info(f"Configuration loaded from {config_path}")
-            return config
+            config = load_config(config_path)
         except Exception as e:
             logging.error(f"Error loading configuration: {e}")
             return self._get_default_config()
+        
+        if config is None:
+            logging.warning(f"Configuration file '{config_path}' not found. Using default values.")
+            return self._get_default_config()
+        
+        logging.info(f"Configuration loaded from {config_path}")
+        return config
     
     def _get_default_config(self):
         """
@@ -68,7 +113,8 @@ class PhantomStrikeClient:
             'SERVER_HOST': '127.0.0.1',
             'SERVER_PORT': '12345',
             'CONNECTION_TIMEOUT': '10',
-            'RETRY_ATTEMPTS': '3'
+            'RETRY_ATTEMPTS': '3',
+            'RETRY_BASE_MS': '50'
         }
         config['LOGGING'] = {
             'LOG_LEVEL': 'INFO',
@@ -80,26 +126,13 @@ class PhantomStrikeClient:
     def _setup_logging(self):
         """
         Set up logging configuration.
+        File and console output are written by a background listener thread.
         """
         log_level = self.config.get('LOGGING', 'LOG_LEVEL', fallback='INFO')
         log_file = self.config.get('LOGGING', 'LOG_FILE', fallback='client.log')
         console_output = self.config.getboolean('LOGGING', 'CONSOLE_OUTPUT', fallback=True)
         
-        # Set up logging
-        logging.basicConfig(
-            filename=log_file,
-            level=getattr(logging, log_level.upper()),
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        # Add console handler if enabled
-        if console_output:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(getattr(logging, log_level.upper()))
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            console_handler.setFormatter(formatter)
-            logging.getLogger().addHandler(console_handler)
+        setup_logging(log_file, getattr(logging, log_level.upper()), console_output)
     
     def collect_system_info(self):
         """
@@ -109,16 +142,7 @@ class PhantomStrikeClient:
             dict: System information dictionary
         """
         try:
-            system_info = {
-                'platform': platform.platform(),
-                'system': platform.system(),
-                'release': platform.release(),
-                'version': platform.version(),
-                'machine': platform.machine(),
-                'processor': platform.processor(),
-                'python_version': platform.python_version(),
-                'timestamp': datetime.now().isoformat()
-            }
+            system_info = {**_static_system_info(), 'timestamp': datetime.now().isoformat()}
             logging.info("System information collected successfully")
             return system_info
         except Exception as e:
@@ -142,13 +166,22 @@ class PhantomStrikeClient:
         except Exception as e:
             logging.error(f"Error sending test message: {e}")
     
+    def _system_info_message(self):
+        """
+        Collect system information and serialize it as a JSON message.
+        
+        Returns:
+            bytes: System information message
+        """
+        system_info = self.collect_system_info()
+        return _SYSINFO_PREFIX + _json_dumps(system_info)
+    
     def send_system_info(self):
         """
         Collect and send system information to the server.
         """
         try:
-            system_info = self.collect_system_info()
-            info_string = f"System Info: {system_info}"
+            info_string = self._system_info_message()
             logging.info("Sending system information to server")
             success = self.data_sender.send_data(info_string)
             if success:
@@ -193,20 +226,19 @@ class PhantomStrikeClient:
         """
         logging.info("Starting automated mode")
         
-        # Send initial greeting
-        self.send_test_message("PhantomStrike Client started")
-        
-        # Wait a moment
-        time.sleep(1)
-        
-        # Send system information
-        self.send_system_info()
-        
-        # Wait a moment
-        time.sleep(1)
-        
-        # Send completion message
-        self.send_test_message("PhantomStrike Client automated sequence completed")
+        try:
+            # Greeting, system information and completion go out in one write
+            messages = [
+                "PhantomStrike Client started",
+                self._system_info_message(),
+                "PhantomStrike Client automated sequence completed"
+            ]
+            if self.data_sender.send_many(messages):
+                logging.info("Automated sequence sent successfully")
+            else:
+                logging.error("Failed to send automated sequence")
+        except Exception as e:
+            logging.error(f"Error in automated mode: {e}")
         
         logging.info("Automated mode completed")
 
@@ -218,20 +250,22 @@ def main():
         # Initialize client
         client = PhantomStrikeClient()
         
-        # Check command line arguments
-        if len(sys.argv) > 1:
-            mode = sys.argv[1].lower()
-            if mode == 'interactive':
-                client.run_interactive_mode()
-            elif mode == 'automated':
-                client.run_automated_mode()
+        # Keep one connection open for the whole session
+        with client.data_sender:
+            # Check command line arguments
+            if len(sys.argv) > 1:
+                mode = sys.argv[1].lower()
+                if mode == 'interactive':
+                    client.run_interactive_mode()
+                elif mode == 'automated':
+                    client.run_automated_mode()
+                else:
+                    print("Usage: python client_main.py [interactive|automated]")
+                    print("Default: automated mode")
+                    client.run_automated_mode()
             else:
-                print("Usage: python client_main.py [interactive|automated]")
-                print("Default: automated mode")
+                # Default to automated mode
                 client.run_automated_mode()
-        else:
-            # Default to automated mode
-            client.run_automated_mode()
             
     except Exception as e:
         logging.error(f"Fatal error in main: {e}")
@@ -0,0 +1,52 @@
+"""
+Configuration loading for PhantomStrike client.
+This module parses each configuration file once and hands out independent copies.
+"""
+
+import os
+import configparser
+import functools
+from typing import Dict, Optional
+
+# Raw option values of every parsed configuration file, keyed by absolute path
+_config_cache: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+@functools.lru_cache(maxsize=8)
+def resolve_config_path(config_file: str) -> str:
+    """
+    Resolve a configuration file name relative to the client directory.
+    
+    Args:
+        config_file (str): Configuration file name
+        
+    Returns:
+        str: Absolute configuration file path
+    """
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', config_file))
+
+def load_config(path: str) -> Optional[configparser.ConfigParser]:
+    """
+    Load a configuration file, parsing it only on the first call.
+    A missing file is not remembered, so it is picked up once it is created.
+    
+    Args:
+        path (str): Absolute configuration file path
+        
+    Returns:
+        configparser.ConfigParser or None: A new parser the caller may modify,
+        or None if the file does not exist
+    """
+    sections = _config_cache.get(path)
+    if sections is None:
+        if not os.path.exists(path):
+            return None
+        parser = configparser.ConfigParser()
+        parser.read(path)
+        sections = {'DEFAULT': dict(parser.defaults())}
+        for name in parser.sections():
+            sections[name] = dict(parser.items(name, raw=True))
+        _config_cache[path] = sections
+    
+    config = configparser.ConfigParser()
+    config.read_dict(sections)
+    return config
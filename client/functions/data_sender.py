@@ -3,10 +3,80 @@ Data transmission module for PhantomStrike client.
 This module handles all communication with the server.
 """
 
+import os
 import socket
 import logging
+import configparser
+import errno
+import ipaddress
+import struct
+import threading
 import time
-from typing import Optional
+from typing import List, Optional, Union
+
+from functions.config_loader import load_config, resolve_config_path
+
+# Every message is prefixed with its length as a 4-byte big-endian integer
+_LENGTH_PREFIX = struct.Struct('>I')
+
+# The server acknowledges each message by echoing it after this prefix
+_ACK_PREFIX = b"Server received: "
+
+# Kernel send buffer size requested for the client socket
+_SOCKET_BUFFER_SIZE = 1 << 20
+
+def _iov_max() -> int:
+    """
+    Get the maximum number of buffers a single sendmsg() call accepts.
+    
+    Returns:
+        int: IOV_MAX of the platform, or 1024 when it cannot be queried
+    """
+    try:
+        return os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        return 1024
+
+# sendmsg() fails with EMSGSIZE when given more buffers than this
+_IOV_MAX = _iov_max()
+
+def _frame(data: Union[str, bytes]) -> bytes:
+    """
+    Encode a message and prefix it with its length.
+    
+    Args:
+        data (str or bytes): Message to encode; bytes are sent as-is
+        
+    Returns:
+        bytes: Length-prefixed UTF-8 message
+    """
+    encoded_data = data if isinstance(data, bytes) else data.encode('utf-8')
+    return _LENGTH_PREFIX.pack(len(encoded_data)) + encoded_data
+
+def _sendmsg_all(client_socket: socket.socket, buffers: List[bytes]):
+    """
+    Write all buffers with as few scatter-gather sendmsg() calls as possible.
+    
+    Args:
+        client_socket (socket.socket): Connected socket
+        buffers (list): Buffers to send, in order
+    """
+    if not hasattr(client_socket, 'sendmsg'):
+        # Windows has no sendmsg(); fall back to one joined write
+        client_socket.sendall(b"".join(buffers))
+        return
+    
+    views = [memoryview(buffer) for buffer in buffers]
+    index = 0
+    while index < len(views):
+        # Never pass more buffers than the kernel accepts in one call
+        sent = client_socket.sendmsg(views[index:index + _IOV_MAX])
+        # Skip past everything the kernel accepted
+        while index < len(views) and sent >= len(views[index]):
+            sent -= len(views[index])
+            index += 1
+        if sent:
+            views[index] = views[index][sent:]
 
 class DataSender:
     """
@@ -26,7 +96,52 @@ class DataSender:
         self.server_port = int(config.get('CLIENT', 'SERVER_PORT', fallback='12345'))
         self.connection_timeout = int(config.get('CLIENT', 'CONNECTION_TIMEOUT', fallback='10'))
         self.retry_attempts = int(config.get('CLIENT', 'RETRY_ATTEMPTS', fallback='3'))
+        self.retry_base_ms = int(config.get('CLIENT', 'RETRY_BASE_MS', fallback='50'))
+        
+        # Resolved once up front; left unset to retry lazily if DNS is unavailable
+        self._sockaddr = None
+        self._resolve_sockaddr()
+        # errno of the last failed connect, 0 if it succeeded
+        self._connect_errno = 0
         
+        # Persistent connection shared by all sends, guarded by _lock
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        # Reused for every acknowledgment read, grown on demand
+        self._ack_buffer = bytearray(1024)
+    
+    def __enter__(self):
+        """
+        Enter the context manager.
+        
+        Returns:
+            DataSender: This data sender
+        """
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the persistent connection when leaving the context manager.
+        """
+        self.close()
+        return False
+        
+    def _resolve_sockaddr(self) -> Optional[tuple]:
+        """
+        Resolve the server address, caching it for later connections.
+        
+        Returns:
+            tuple or None: Socket address or None if resolution failed
+        """
+        if self._sockaddr is None:
+            try:
+                self._sockaddr = socket.getaddrinfo(
+                    self.server_host, self.server_port, socket.AF_INET, socket.SOCK_STREAM
+                )[0][-1]
+            except socket.gaierror as e:
+                logging.warning("Could not resolve %s: %s", self.server_host, e)
+        return self._sockaddr
+    
     def _create_connection(self) -> Optional[socket.socket]:
         """
         Create a connection to the server.
@@ -34,77 +149,212 @@ class DataSender:
         Returns:
             socket.socket or None: Connected socket or None if failed
         """
+        sockaddr = self._resolve_sockaddr()
+        if sockaddr is None:
+            return None
+        
         try:
             client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             client_socket.settimeout(self.connection_timeout)
-            client_socket.connect((self.server_host, self.server_port))
-            logging.debug(f"Connected to server {self.server_host}:{self.server_port}")
+            try:
+                client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER_SIZE)
+            except OSError as e:
+                logging.debug("Could not set SO_SNDBUF: %s", e)
+            # connect_ex reports failures as an errno instead of raising
+            err = client_socket.connect_ex(sockaddr)
+            self._connect_errno = err
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                # A connect that times out reports EAGAIN rather than raising
+                client_socket.close()
+                logging.error("Connection timeout to %s:%s", self.server_host, self.server_port)
+                return None
+            if err:
+                client_socket.close()
+                logging.error("Error connecting to %s:%s: %s", self.server_host, self.server_port, os.strerror(err))
+                return None
+            self._tune_socket(client_socket)
+            logging.debug("Connected to server %s:%s", self.server_host, self.server_port)
             return client_socket
-        except socket.timeout:
-            logging.error(f"Connection timeout to {self.server_host}:{self.server_port}")
-            return None
         except socket.error as e:
-            logging.error(f"Socket error connecting to {self.server_host}:{self.server_port}: {e}")
+            logging.error("Socket error connecting to %s:%s: %s", self.server_host, self.server_port, e)
             return None
         except Exception as e:
-            logging.error(f"Unexpected error connecting to server: {e}")
+            logging.error("Unexpected error connecting to server: %s", e)
             return None
     
-    def _send_data_once(self, data: str) -> bool:
+    def _tune_socket(self, client_socket: socket.socket):
         """
-        Send data to server in a single attempt.
+        Configure a connected socket for small, latency-sensitive messages.
         
         Args:
-            data (str): Data to send
-            
-        Returns:
-            bool: True if successful, False otherwise
+            client_socket (socket.socket): Connected socket
         """
-        client_socket = None
         try:
-            # Create connection
-            client_socket = self._create_connection()
-            if not client_socket:
-                return False
-            
-            # Send data
-            encoded_data = data.encode('utf-8')
-            client_socket.sendall(encoded_data)
-            logging.debug(f"Data sent successfully: {data[:50]}...")
-            
-            # Try to receive acknowledgment
+            # Small messages must not wait for Nagle's algorithm
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Detect dead peers on the long-lived pooled connection
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except OSError as e:
+            logging.debug("Could not tune socket options: %s", e)
+        self._rearm_quickack(client_socket)
+    
+    @staticmethod
+    def _rearm_quickack(client_socket: socket.socket):
+        """
+        Ask the kernel to acknowledge incoming data immediately.
+        Linux clears TCP_QUICKACK after some reads, so it is re-armed after each recv.
+        
+        Args:
+            client_socket (socket.socket): Connected socket
+        """
+        if hasattr(socket, 'TCP_QUICKACK'):
             try:
-                response = client_socket.recv(1024)
-                if response:
-                    ack_message = response.decode('utf-8')
-                    logging.debug(f"Received acknowledgment: {ack_message}")
-            except socket.timeout:
-                logging.warning("No acknowledgment received from server")
-            except Exception as e:
-                logging.warning(f"Error receiving acknowledgment: {e}")
-            
-            return True
-            
-        except socket.error as e:
-            logging.error(f"Socket error sending data: {e}")
-            return False
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            except OSError:
+                pass
+    
+    def _get_socket(self) -> Optional[socket.socket]:
+        """
+        Return the persistent connection, connecting first if needed.
+        
+        Returns:
+            socket.socket or None: Connected socket or None if failed
+        """
+        if self._sock is None:
+            self._sock = self._create_connection()
+        return self._sock
+    
+    def _drop_socket(self):
+        """
+        Close and forget the persistent connection.
+        """
+        if self._sock is None:
+            return
+        try:
+            self._sock.close()
+            logging.debug("Connection closed")
         except Exception as e:
-            logging.error(f"Unexpected error sending data: {e}")
-            return False
+            logging.warning("Error closing connection: %s", e)
         finally:
-            if client_socket:
+            self._sock = None
+    
+    def close(self):
+        """
+        Close the persistent connection to the server.
+        """
+        with self._lock:
+            self._drop_socket()
+    
+    def _send_frames(self, frames: List[bytes]) -> Optional[bytes]:
+        """
+        Send length-prefixed messages over the persistent connection.
+        A connection that turns out to be stale is replaced once.
+        
+        Args:
+            frames (list): Length-prefixed messages to send
+            
+        Returns:
+            bytes or None: Server response (empty if none arrived) or None if sending failed
+        """
+        with self._lock:
+            while True:
+                reused = self._sock is not None
+                client_socket = self._get_socket()
+                if not client_socket:
+                    return None
+                
                 try:
-                    client_socket.close()
-                    logging.debug("Connection closed")
+                    if len(frames) == 1:
+                        client_socket.sendall(frames[0])
+                    else:
+                        _sendmsg_all(client_socket, frames)
+                    logging.debug("Sent %s message(s) successfully", len(frames))
+                    try:
+                        response = self._recv_acks(client_socket, frames)
+                    except socket.timeout:
+                        # A late response would be mistaken for the next one
+                        logging.warning("No acknowledgment received from server")
+                        self._drop_socket()
+                        return b""
+                except socket.timeout:
+                    # Part of the data may have been written; the stream is unusable
+                    self._drop_socket()
+                    logging.error("Timeout sending data to %s:%s", self.server_host, self.server_port)
+                    return None
+                except socket.error as e:
+                    self._drop_socket()
+                    if reused:
+                        logging.debug("Stale connection, reconnecting: %s", e)
+                        continue
+                    logging.error("Socket error sending data: %s", e)
+                    return None
                 except Exception as e:
-                    logging.warning(f"Error closing connection: {e}")
+                    self._drop_socket()
+                    logging.error("Unexpected error sending data: %s", e)
+                    return None
+                
+                if not response:
+                    # The server closed the connection
+                    self._drop_socket()
+                    if reused:
+                        logging.debug("Server closed the connection, reconnecting")
+                        continue
+                return response
+    
+    def _recv_acks(self, client_socket: socket.socket, frames: List[bytes]) -> bytes:
+        """
+        Receive the acknowledgments for a batch of sent messages.
+        Each acknowledgment is the ack prefix followed by the message body,
+        so the expected size is known up front.
+        
+        Args:
+            client_socket (socket.socket): Connected socket
+            frames (list): Length-prefixed messages that were sent
+            
+        Returns:
+            bytes: Received acknowledgments, short if the server closed the connection
+        """
+        expected = sum(len(_ACK_PREFIX) + len(frame) - _LENGTH_PREFIX.size for frame in frames)
+        if expected > len(self._ack_buffer):
+            self._ack_buffer = bytearray(expected)
+        
+        received = 0
+        with memoryview(self._ack_buffer) as view:
+            while received < expected:
+                count = client_socket.recv_into(view[received:expected])
+                self._rearm_quickack(client_socket)
+                if not count:
+                    break
+                received += count
+            return bytes(view[:received])
+    
+    def _send_data_once(self, data: Union[str, bytes]) -> bool:
+        """
+        Send data to server in a single attempt.
+        
+        Args:
+            data (str or bytes): Data to send
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        response = self._send_frames([_frame(data)])
+        if response is None:
+            return False
+        
+        if response:
+            try:
+                logging.debug("Received acknowledgment: %s", response.decode('utf-8'))
+            except Exception as e:
+                logging.warning("Error receiving acknowledgment: %s", e)
+        return True
     
-    def send_data(self, data: str) -> bool:
+    def send_data(self, data: Union[str, bytes]) -> bool:
         """
         Send data to server with retry logic.
         
         Args:
-            data (str): Data to send to server
+            data (str or bytes): Data to send to server; bytes skip encoding
             
         Returns:
             bool: True if data was sent successfully, False otherwise
@@ -113,69 +363,108 @@ class DataSender:
             logging.warning("Empty data provided, nothing to send")
             return False
         
-        logging.info(f"Attempting to send data to {self.server_host}:{self.server_port}")
-        logging.debug(f"Data content: {data}")
+        logging.info("Attempting to send data to %s:%s", self.server_host, self.server_port)
+        logging.debug("Data content: %s", data)
+        
+        return self._with_retries(self._send_data_once, data)
+    
+    def send_many(self, messages: List[Union[str, bytes]]) -> bool:
+        """
+        Send several messages to server with a single scatter-gather write.
         
+        Args:
+            messages (list): Messages (str or bytes) to send, in order
+            
+        Returns:
+            bool: True if all messages were sent successfully, False otherwise
+        """
+        messages = [message for message in messages if message and message.strip()]
+        if not messages:
+            logging.warning("Empty data provided, nothing to send")
+            return False
+        
+        logging.info("Attempting to send %s messages to %s:%s", len(messages), self.server_host, self.server_port)
+        
+        frames = [_frame(message) for message in messages]
+        return self._with_retries(self._send_frames_once, frames)
+    
+    def _send_frames_once(self, frames: List[bytes]) -> bool:
+        """
+        Send several length-prefixed messages to server in a single attempt.
+        
+        Args:
+            frames (list): Length-prefixed messages to send
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._send_frames(frames) is not None
+    
+    def _with_retries(self, send_once, payload) -> bool:
+        """
+        Call a single-attempt send function with retry logic.
+        
+        Args:
+            send_once: Function that sends payload once and returns a bool
+            payload: Data passed to send_once
+            
+        Returns:
+            bool: True if any attempt succeeded, False otherwise
+        """
         for attempt in range(1, self.retry_attempts + 1):
-            logging.debug(f"Attempt {attempt}/{self.retry_attempts}")
+            logging.debug("Attempt %s/%s", attempt, self.retry_attempts)
             
-            if self._send_data_once(data):
-                logging.info(f"Data sent successfully on attempt {attempt}")
+            if send_once(payload):
+                logging.info("Data sent successfully on attempt %s", attempt)
                 return True
             
+            if self._refused_by_loopback():
+                # Nothing is listening locally; waiting will not change that
+                logging.error("Connection refused by %s, not retrying", self.server_host)
+                break
+            
             if attempt < self.retry_attempts:
-                wait_time = attempt * 2  # Exponential backoff
-                logging.warning(f"Attempt {attempt} failed, retrying in {wait_time} seconds...")
+                wait_time = (self.retry_base_ms * (2 ** (attempt - 1))) / 1000  # Exponential backoff
+                logging.warning("Attempt %s failed, retrying in %s seconds...", attempt, wait_time)
                 time.sleep(wait_time)
             else:
-                logging.error(f"All {self.retry_attempts} attempts failed")
+                logging.error("All %s attempts failed", self.retry_attempts)
         
         return False
     
-    def send_data_with_response(self, data: str) -> Optional[str]:
+    def _refused_by_loopback(self) -> bool:
+        """
+        Check whether the last connect was refused by a loopback address.
+        
+        Returns:
+            bool: True if retrying cannot help, False otherwise
+        """
+        if self._connect_errno != errno.ECONNREFUSED or self._sockaddr is None:
+            return False
+        return ipaddress.ip_address(self._sockaddr[0]).is_loopback
+    
+    def send_data_with_response(self, data: Union[str, bytes]) -> Optional[str]:
         """
         Send data to server and return the response.
         
         Args:
-            data (str): Data to send to server
+            data (str or bytes): Data to send to server
             
         Returns:
             str or None: Server response or None if failed
         """
-        client_socket = None
         try:
-            # Create connection
-            client_socket = self._create_connection()
-            if not client_socket:
-                return None
-            
-            # Send data
-            encoded_data = data.encode('utf-8')
-            client_socket.sendall(encoded_data)
-            logging.debug(f"Data sent: {data}")
-            
-            # Receive response
-            response = client_socket.recv(1024)
+            response = self._send_frames([_frame(data)])
             if response:
                 response_str = response.decode('utf-8')
-                logging.debug(f"Received response: {response_str}")
+                logging.debug("Received response: %s", response_str)
                 return response_str
-            else:
+            elif response is not None:
                 logging.warning("No response received from server")
-                return None
-                
-        except socket.error as e:
-            logging.error(f"Socket error in send_data_with_response: {e}")
             return None
         except Exception as e:
-            logging.error(f"Unexpected error in send_data_with_response: {e}")
+            logging.error("Unexpected error in send_data_with_response: %s", e)
             return None
-        finally:
-            if client_socket:
-                try:
-                    client_socket.close()
-                except Exception as e:
-                    logging.warning(f"Error closing connection: {e}")
     
     def test_connection(self) -> bool:
         """
@@ -184,7 +473,7 @@ class DataSender:
         Returns:
             bool: True if connection successful, False otherwise
         """
-        logging.info(f"Testing connection to {self.server_host}:{self.server_port}")
+        logging.info("Testing connection to %s:%s", self.server_host, self.server_port)
         return self.send_data("CONNECTION_TEST")
     
     def get_server_info(self) -> Optional[str]:
@@ -207,24 +496,23 @@ def send_data_to_server(data: str, config_file: str = 'client_config.ini') -> bo
     Returns:
         bool: True if successful, False otherwise
     """
-    import configparser
-    import os
-    
     # Load configuration
-    config = configparser.ConfigParser()
-    config_path = os.path.join(os.path.dirname(__file__), '..', config_file)
+    config_path = resolve_config_path(config_file)
+    config = load_config(config_path)
     
-    if not os.path.exists(config_path):
-        logging.warning(f"Configuration file '{config_path}' not found. Using default values.")
+    if config is None:
+        logging.warning("Configuration file '%s' not found. Using default values.", config_path)
+        config = configparser.ConfigParser()
         config['CLIENT'] = {
             'SERVER_HOST': '127.0.0.1',
             'SERVER_PORT': '12345',
             'CONNECTION_TIMEOUT': '10',
             'RETRY_ATTEMPTS': '3'
         }
-    else:
-        config.read(config_path)
     
     # Create sender and send data
     sender = DataSender(config)
-    return sender.send_data(data)
+    try:
+        return sender.send_data(data)
+    finally:
+        sender.close()
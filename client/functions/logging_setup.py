@@ -0,0 +1,104 @@
+"""
+Logging setup for PhantomStrike client.
+This module moves log file and console output onto a background listener thread.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+# One formatter shared by every handler
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Listener shared by the whole process, started on the first setup_logging() call
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Queue handler installed on the root logger by setup_logging()
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+def _is_implicit_handler(handler: logging.Handler) -> bool:
+    """
+    Check whether a handler is the stderr handler that logging.basicConfig()
+    installs when something logs before logging is configured.
+    
+    Args:
+        handler (logging.Handler): Handler attached to the root logger
+    
+    Returns:
+        bool: True for the implicit basicConfig() handler
+    """
+    return (type(handler) is logging.StreamHandler
+            and handler.formatter is not None
+            and handler.formatter._fmt == logging.BASIC_FORMAT)
+
+def setup_logging(log_file: str, level: int = logging.INFO,
+                  console_output: bool = True) -> logging.handlers.QueueListener:
+    """
+    Route all log records through a queue to a listener thread that owns the
+    file and console handlers. Later calls return the already running listener.
+    
+    Args:
+        log_file (str): Path of the log file
+        level (int): Logging level for the root logger and handlers
+        console_output (bool): Also write log records to the console
+    
+    Returns:
+        logging.handlers.QueueListener: Started listener that owns the real handlers
+    """
+    global _listener, _queue_handler
+    
+    if _listener is not None:
+        return _listener
+    
+    file_handler = logging.FileHandler(log_file, delay=True)
+    file_handler.setLevel(level)
+    file_handler.setFormatter(_FORMATTER)
+    handlers = [file_handler]
+    
+    if console_output:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+        console_handler.setFormatter(_FORMATTER)
+        handlers.append(console_handler)
+    
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    
+    # Replace the handler installed implicitly by earlier logging calls, but
+    # keep any the host application added itself
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        if _is_implicit_handler(handler):
+            root_logger.removeHandler(handler)
+            handler.close()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    root_logger.setLevel(level)
+    
+    listener.start()
+    atexit.register(stop_logging)
+    _listener = listener
+    return listener
+
+def stop_logging():
+    """
+    Stop the logging listener and flush and close its handlers.
+    """
+    global _listener, _queue_handler
+    
+    if _listener is None:
+        return
+    # Records logged afterwards would pile up in a queue nobody drains
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -8,7 +8,7 @@ import os
 
 # Dependencies are automatically detected, but it might be fine tuned.
 build_exe_options = {
-    "packages": ["socket", "os", "sys", "logging", "configparser", "platform", "time", "datetime"],
+    "packages": ["socket", "os", "sys", "logging", "configparser", "platform", "time", "datetime", "json", "queue"],
     "excludes": ["tkinter", "unittest", "pydoc", "doctest", "argparse"],
     "include_files": ["client_config.ini", "core/", "functions/"]
 }
@@ -5,6 +5,7 @@ Tests the PhantomStrikeClient class and main functionality.
 
 import unittest
 import configparser
+import json
 import os
 import sys
 from unittest.mock import Mock, patch, MagicMock
@@ -12,7 +13,7 @@ from unittest.mock import Mock, patch, MagicMock
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.client_main import PhantomStrikeClient
+from core.client_main import PhantomStrikeClient, _static_system_info
 
 class TestPhantomStrikeClient(unittest.TestCase):
     """Test cases for PhantomStrikeClient class."""
@@ -31,6 +32,13 @@ class TestPhantomStrikeClient(unittest.TestCase):
             'LOG_FILE': 'test_client.log',
             'CONSOLE_OUTPUT': 'false'
         }
+        # Static system information is cached per process
+        _static_system_info.cache_clear()
+        self.addCleanup(_static_system_info.cache_clear)
+        # Keep the process-wide logging listener out of unit tests
+        logging_patcher = patch('core.client_main.setup_logging')
+        self.mock_setup_logging = logging_patcher.start()
+        self.addCleanup(logging_patcher.stop)
     
     @patch('core.client_main.DataSender')
     def test_initialization_with_config(self, mock_data_sender):
@@ -44,6 +52,14 @@ class TestPhantomStrikeClient(unittest.TestCase):
         self.assertIsNotNone(client.data_sender)
         mock_data_sender.assert_called_once()
     
+    def test_setup_logging(self):
+        """Test that logging goes through the shared logging setup."""
+        client = PhantomStrikeClient()
+        
+        log_file = client.config.get('LOGGING', 'LOG_FILE', fallback='client.log')
+        self.mock_setup_logging.assert_called_once()
+        self.assertEqual(self.mock_setup_logging.call_args[0][0], log_file)
+    
     def test_get_default_config(self):
         """Test default configuration creation."""
         client = PhantomStrikeClient()
@@ -90,6 +106,18 @@ class TestPhantomStrikeClient(unittest.TestCase):
         self.assertEqual(system_info['platform'], "Windows-10-10.0.19041-SP0")
         self.assertEqual(system_info['system'], "Windows")
     
+    @patch('platform.platform', return_value="Linux-5.15")
+    def test_collect_system_info_cached(self, mock_platform):
+        """Test that static system information is collected only once."""
+        client = PhantomStrikeClient()
+        
+        first = client.collect_system_info()
+        second = client.collect_system_info()
+        
+        mock_platform.assert_called_once()
+        self.assertEqual(first['platform'], second['platform'])
+        self.assertIn('timestamp', second)
+    
     def test_collect_system_info_error(self):
         """Test system information collection with error."""
         with patch('platform.platform', side_effect=Exception("Platform error")):
@@ -152,7 +180,11 @@ class TestPhantomStrikeClient(unittest.TestCase):
         mock_data_sender.send_data.assert_called_once()
         # Check that the data contains system info
         call_args = mock_data_sender.send_data.call_args[0][0]
-        self.assertIn("System Info:", call_args)
+        self.assertTrue(call_args.startswith(b"System Info: "))
+        # The payload is compact, parseable JSON
+        payload = call_args[len(b"System Info: "):]
+        self.assertEqual(json.loads(payload), {'platform': 'Windows', 'system': 'Windows'})
+        self.assertNotIn(b" ", payload)
     
     @patch.object(PhantomStrikeClient, 'collect_system_info')
     @patch('core.client_main.DataSender')
@@ -243,24 +275,39 @@ class TestPhantomStrikeClient(unittest.TestCase):
         client.run_interactive_mode()
     
     @patch('time.sleep')
-    @patch.object(PhantomStrikeClient, 'send_test_message')
-    @patch.object(PhantomStrikeClient, 'send_system_info')
-    def test_run_automated_mode(self, mock_send_system_info, mock_send_test_message, mock_sleep):
+    @patch.object(PhantomStrikeClient, 'collect_system_info')
+    def test_run_automated_mode(self, mock_collect_info, mock_sleep):
         """Test automated mode execution."""
+        mock_collect_info.return_value = {'platform': 'Windows', 'system': 'Windows'}
+        
         client = PhantomStrikeClient()
         client.config = self.config
+        client.data_sender = Mock()
+        client.data_sender.send_many.return_value = True
         
         client.run_automated_mode()
         
-        # Should call send_test_message twice and send_system_info once
-        self.assertEqual(mock_send_test_message.call_count, 2)
-        mock_send_system_info.assert_called_once()
-        # Should sleep twice
-        self.assertEqual(mock_sleep.call_count, 2)
+        # All three messages should go out in a single batch
+        client.data_sender.send_many.assert_called_once()
+        messages = client.data_sender.send_many.call_args[0][0]
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[0], "PhantomStrike Client started")
+        self.assertTrue(messages[1].startswith(b"System Info: "))
+        self.assertEqual(messages[2], "PhantomStrike Client automated sequence completed")
+        client.data_sender.send_data.assert_not_called()
+        # Messages are pipelined without pacing delays
+        mock_sleep.assert_not_called()
 
 class TestMainFunction(unittest.TestCase):
     """Test cases for main function."""
     
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # Keep the process-wide logging listener out of unit tests
+        logging_patcher = patch('core.client_main.setup_logging')
+        logging_patcher.start()
+        self.addCleanup(logging_patcher.stop)
+    
     @patch('sys.argv', ['client_main.py', 'interactive'])
     @patch.object(PhantomStrikeClient, 'run_interactive_mode')
     def test_main_interactive_mode(self, mock_run_interactive):
@@ -0,0 +1,54 @@
+"""
+Unit tests for config_loader module.
+Tests the cached configuration loader.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions import config_loader
+
+class TestConfigLoader(unittest.TestCase):
+    """Test cases for load_config()."""
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        patcher = patch.dict(config_loader._config_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'client_config.ini')
+    
+    def test_missing_file_not_cached(self):
+        """Test that a configuration file created after a failed load is picked up."""
+        self.assertIsNone(config_loader.load_config(self.path))
+        
+        with open(self.path, 'w') as f:
+            f.write("[CLIENT]\nSERVER_PORT = 23456\n")
+        
+        config = config_loader.load_config(self.path)
+        self.assertEqual(config.get('CLIENT', 'SERVER_PORT'), '23456')
+    
+    def test_returns_independent_copies(self):
+        """Test that modifying a loaded configuration does not affect later loads."""
+        with open(self.path, 'w') as f:
+            f.write("[CLIENT]\nSERVER_HOST = 10.0.0.1\nLABEL = %%(SERVER_HOST)s\n")
+        
+        first = config_loader.load_config(self.path)
+        first.set('CLIENT', 'SERVER_HOST', '10.0.0.2')
+        first.remove_section('CLIENT')
+        
+        second = config_loader.load_config(self.path)
+        self.assertEqual(second.get('CLIENT', 'SERVER_HOST'), '10.0.0.1')
+        self.assertEqual(second.get('CLIENT', 'LABEL'), '%(SERVER_HOST)s')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ Tests the DataSender class and related functions.
 
 import unittest
 import configparser
+import errno
 import socket
 from unittest.mock import Mock, patch, MagicMock
 import sys
@@ -13,7 +14,18 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from functions.data_sender import DataSender, send_data_to_server
+from functions import config_loader
+from functions.data_sender import DataSender, send_data_to_server, _sendmsg_all
+
+def recv_into_chunks(*chunks):
+    """Build a recv_into side effect that delivers the given chunks in order."""
+    pending = list(chunks)
+    
+    def recv_into(buffer, nbytes=0):
+        chunk = pending.pop(0)
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+    return recv_into
 
 class TestDataSender(unittest.TestCase):
     """Test cases for DataSender class."""
@@ -35,6 +47,7 @@ class TestDataSender(unittest.TestCase):
         self.assertEqual(self.data_sender.server_port, 12345)
         self.assertEqual(self.data_sender.connection_timeout, 5)
         self.assertEqual(self.data_sender.retry_attempts, 2)
+        self.assertEqual(self.data_sender.retry_base_ms, 50)
     
     def test_initialization_with_defaults(self):
         """Test DataSender initialization with default values."""
@@ -49,48 +62,132 @@ class TestDataSender(unittest.TestCase):
     def test_create_connection_success(self, mock_socket):
         """Test successful connection creation."""
         mock_sock = Mock()
+        mock_sock.connect_ex.return_value = 0
         mock_socket.return_value = mock_sock
         
         result = self.data_sender._create_connection()
         
         self.assertIsNotNone(result)
         mock_sock.settimeout.assert_called_once_with(5)
-        mock_sock.connect.assert_called_once_with(('127.0.0.1', 12345))
+        mock_sock.connect_ex.assert_called_once_with(('127.0.0.1', 12345))
+        mock_sock.setsockopt.assert_any_call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        mock_sock.setsockopt.assert_any_call(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
     
     @patch('socket.socket')
     def test_create_connection_timeout(self, mock_socket):
         """Test connection creation with timeout."""
         mock_sock = Mock()
-        mock_sock.connect.side_effect = socket.timeout()
+        mock_sock.connect_ex.return_value = errno.EAGAIN
         mock_socket.return_value = mock_sock
         
-        result = self.data_sender._create_connection()
+        with self.assertLogs(level='ERROR') as logs:
+            result = self.data_sender._create_connection()
         
         self.assertIsNone(result)
+        self.assertIn("Connection timeout", logs.output[0])
+        mock_sock.close.assert_called_once()
     
     @patch('socket.socket')
     def test_create_connection_error(self, mock_socket):
         """Test connection creation with socket error."""
         mock_sock = Mock()
-        mock_sock.connect.side_effect = socket.error("Connection refused")
+        mock_sock.connect_ex.return_value = errno.ECONNREFUSED
         mock_socket.return_value = mock_sock
         
         result = self.data_sender._create_connection()
         
         self.assertIsNone(result)
+        mock_sock.close.assert_called_once()
+    
+    @patch('socket.getaddrinfo')
+    def test_resolve_sockaddr_cached(self, mock_getaddrinfo):
+        """Test that the server address is resolved once and reused."""
+        mock_getaddrinfo.return_value = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.1', 12345))]
+        sender = DataSender(self.config)
+        
+        self.assertEqual(sender._resolve_sockaddr(), ('10.0.0.1', 12345))
+        self.assertEqual(sender._resolve_sockaddr(), ('10.0.0.1', 12345))
+        mock_getaddrinfo.assert_called_once()
+    
+    @patch('socket.getaddrinfo')
+    def test_resolve_sockaddr_lazy_after_failure(self, mock_getaddrinfo):
+        """Test that a failed lookup at init is retried on connect."""
+        mock_getaddrinfo.side_effect = [
+            socket.gaierror("Name or service not known"),
+            [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.0.0.1', 12345))]
+        ]
+        sender = DataSender(self.config)
+        self.assertIsNone(sender._sockaddr)
+        
+        self.assertEqual(sender._resolve_sockaddr(), ('10.0.0.1', 12345))
     
     @patch.object(DataSender, '_create_connection')
     def test_send_data_once_success(self, mock_create_connection):
         """Test successful data sending in single attempt."""
         mock_socket = Mock()
-        mock_socket.recv.return_value = b"ACK"
+        mock_socket.recv_into.side_effect = recv_into_chunks(b"Server received: test data")
         mock_create_connection.return_value = mock_socket
         
         result = self.data_sender._send_data_once("test data")
         
         self.assertTrue(result)
-        mock_socket.sendall.assert_called_once_with(b"test data")
+        mock_socket.sendall.assert_called_once_with(b"\x00\x00\x00\x09test data")
+        # The connection stays open for the next message
+        mock_socket.close.assert_not_called()
+    
+    @patch.object(DataSender, '_create_connection')
+    def test_send_data_once_bytes(self, mock_create_connection):
+        """Test that bytes are sent without re-encoding."""
+        mock_socket = Mock()
+        mock_socket.recv_into.side_effect = recv_into_chunks(b"Server received: {\"a\":1}")
+        mock_create_connection.return_value = mock_socket
+        
+        result = self.data_sender._send_data_once(b"{\"a\":1}")
+        
+        self.assertTrue(result)
+        mock_socket.sendall.assert_called_once_with(b"\x00\x00\x00\x07{\"a\":1}")
+    
+    @patch.object(DataSender, '_create_connection')
+    def test_send_data_once_reuses_connection(self, mock_create_connection):
+        """Test that consecutive sends share one connection."""
+        mock_socket = Mock()
+        mock_socket.recv_into.side_effect = recv_into_chunks(b"Server received: first", b"Server received: second")
+        mock_create_connection.return_value = mock_socket
+        
+        self.assertTrue(self.data_sender._send_data_once("first"))
+        self.assertTrue(self.data_sender._send_data_once("second"))
+        
+        mock_create_connection.assert_called_once()
+        self.assertEqual(mock_socket.sendall.call_count, 2)
+    
+    @patch.object(DataSender, '_create_connection')
+    def test_send_data_once_reconnects_stale_connection(self, mock_create_connection):
+        """Test that a stale pooled connection is replaced once."""
+        stale_socket = Mock()
+        stale_socket.recv_into.side_effect = recv_into_chunks(b"Server received: first", b"")  # Server closed after first message
+        fresh_socket = Mock()
+        fresh_socket.recv_into.side_effect = recv_into_chunks(b"Server received: second")
+        mock_create_connection.side_effect = [stale_socket, fresh_socket]
+        
+        self.assertTrue(self.data_sender._send_data_once("first"))
+        self.assertTrue(self.data_sender._send_data_once("second"))
+        
+        self.assertEqual(mock_create_connection.call_count, 2)
+        stale_socket.close.assert_called_once()
+        fresh_socket.sendall.assert_called_once_with(b"\x00\x00\x00\x06second")
+    
+    @patch.object(DataSender, '_create_connection')
+    def test_close(self, mock_create_connection):
+        """Test closing the persistent connection."""
+        mock_socket = Mock()
+        mock_socket.recv_into.side_effect = recv_into_chunks(b"Server received: test data")
+        mock_create_connection.return_value = mock_socket
+        
+        with self.data_sender as sender:
+            sender._send_data_once("test data")
+        
         mock_socket.close.assert_called_once()
+        self.assertIsNone(self.data_sender._sock)
     
     @patch.object(DataSender, '_create_connection')
     def test_send_data_once_no_connection(self, mock_create_connection):
@@ -113,6 +210,31 @@ class TestDataSender(unittest.TestCase):
         self.assertFalse(result)
         mock_socket.close.assert_called_once()
     
+    @patch.object(DataSender, '_create_connection')
+    def test_send_data_once_send_timeout(self, mock_create_connection):
+        """Test that a write timing out partway fails instead of counting as sent."""
+        mock_socket = Mock()
+        mock_socket.sendall.side_effect = socket.timeout()
+        mock_create_connection.return_value = mock_socket
+        
+        result = self.data_sender._send_data_once("test data")
+        
+        self.assertFalse(result)
+        mock_socket.recv_into.assert_not_called()
+        mock_socket.close.assert_called_once()
+    
+    @patch.object(DataSender, '_create_connection')
+    def test_send_data_once_ack_timeout(self, mock_create_connection):
+        """Test that data sent without a timely acknowledgment still counts as sent."""
+        mock_socket = Mock()
+        mock_socket.recv_into.side_effect = socket.timeout()
+        mock_create_connection.return_value = mock_socket
+        
+        result = self.data_sender._send_data_once("test data")
+        
+        self.assertTrue(result)
+        mock_socket.close.assert_called_once()
+    
     @patch.object(DataSender, '_send_data_once')
     def test_send_data_success_first_attempt(self, mock_send_once):
         """Test successful data sending on first attempt."""
@@ -133,7 +255,7 @@ class TestDataSender(unittest.TestCase):
         
         self.assertTrue(result)
         self.assertEqual(mock_send_once.call_count, 2)
-        mock_sleep.assert_called_once_with(2)  # First retry after 2 seconds
+        mock_sleep.assert_called_once_with(0.05)  # First retry after RETRY_BASE_MS
     
     @patch.object(DataSender, '_send_data_once')
     @patch('time.sleep')
@@ -145,7 +267,22 @@ class TestDataSender(unittest.TestCase):
         
         self.assertFalse(result)
         self.assertEqual(mock_send_once.call_count, 2)  # Should retry 2 times
-        mock_sleep.assert_called_once_with(2)
+        mock_sleep.assert_called_once_with(0.05)
+    
+    @patch.object(DataSender, '_send_data_once')
+    @patch('time.sleep')
+    def test_send_data_refused_by_loopback(self, mock_sleep, mock_send_once):
+        """Test that a refused loopback connection is not retried."""
+        def refused(data):
+            self.data_sender._connect_errno = errno.ECONNREFUSED
+            return False
+        mock_send_once.side_effect = refused
+        
+        result = self.data_sender.send_data("test data")
+        
+        self.assertFalse(result)
+        mock_send_once.assert_called_once()
+        mock_sleep.assert_not_called()
     
     def test_send_data_empty_string(self):
         """Test sending empty data."""
@@ -159,14 +296,13 @@ class TestDataSender(unittest.TestCase):
     def test_send_data_with_response_success(self, mock_create_connection):
         """Test sending data and receiving response."""
         mock_socket = Mock()
-        mock_socket.recv.return_value = b"Server response"
+        mock_socket.recv_into.side_effect = recv_into_chunks(b"Server received: test data")
         mock_create_connection.return_value = mock_socket
         
         result = self.data_sender.send_data_with_response("test data")
         
-        self.assertEqual(result, "Server response")
-        mock_socket.sendall.assert_called_once_with(b"test data")
-        mock_socket.close.assert_called_once()
+        self.assertEqual(result, "Server received: test data")
+        mock_socket.sendall.assert_called_once_with(b"\x00\x00\x00\x09test data")
     
     @patch.object(DataSender, '_create_connection')
     def test_send_data_with_response_no_connection(self, mock_create_connection):
@@ -177,6 +313,66 @@ class TestDataSender(unittest.TestCase):
         
         self.assertIsNone(result)
     
+    @patch.object(DataSender, '_create_connection')
+    def test_send_many_success(self, mock_create_connection):
+        """Test sending several messages in one batch."""
+        mock_socket = Mock()
+        mock_socket.sendmsg.side_effect = lambda buffers: sum(len(b) for b in buffers)
+        # Acknowledgments may arrive split across several reads
+        mock_socket.recv_into.side_effect = recv_into_chunks(b"Server received: oneServer rec", b"eived: twoServer received: three")
+        mock_create_connection.return_value = mock_socket
+        
+        result = self.data_sender.send_many(["one", "two", "three"])
+        
+        self.assertTrue(result)
+        mock_socket.sendmsg.assert_called_once()
+        mock_socket.sendall.assert_not_called()
+        self.assertEqual(mock_socket.recv_into.call_count, 2)
+    
+    def test_send_many_empty(self):
+        """Test sending an empty batch."""
+        self.assertFalse(self.data_sender.send_many([]))
+        self.assertFalse(self.data_sender.send_many(["", "   "]))
+    
+    def test_sendmsg_all_partial_writes(self):
+        """Test that partial sendmsg writes resume where they stopped."""
+        written = bytearray()
+        
+        def sendmsg(buffers):
+            # Accept at most 5 bytes per call
+            chunk = b"".join(bytes(b) for b in buffers)[:5]
+            written.extend(chunk)
+            return len(chunk)
+        
+        mock_socket = Mock()
+        mock_socket.sendmsg.side_effect = sendmsg
+        
+        _sendmsg_all(mock_socket, [b"abc", b"defgh", b"ijklmn"])
+        
+        self.assertEqual(bytes(written), b"abcdefghijklmn")
+        self.assertEqual(mock_socket.sendmsg.call_count, 3)
+    
+    def test_sendmsg_all_more_buffers_than_iov_max(self):
+        """Test that a batch larger than IOV_MAX is sent in slices."""
+        written = bytearray()
+        
+        def sendmsg(buffers):
+            if len(buffers) > 1024:
+                raise OSError(errno.EMSGSIZE, "Message too long")
+            chunk = b"".join(bytes(b) for b in buffers)
+            written.extend(chunk)
+            return len(chunk)
+        
+        mock_socket = Mock()
+        mock_socket.sendmsg.side_effect = sendmsg
+        buffers = [b"%d," % i for i in range(2500)]
+        
+        with patch('functions.data_sender._IOV_MAX', 1024):
+            _sendmsg_all(mock_socket, buffers)
+        
+        self.assertEqual(bytes(written), b"".join(buffers))
+        self.assertEqual(mock_socket.sendmsg.call_count, 3)
+    
     @patch.object(DataSender, 'send_data')
     def test_test_connection(self, mock_send_data):
         """Test connection testing."""
@@ -224,5 +420,17 @@ class TestSendDataToServerFunction(unittest.TestCase):
         self.assertFalse(result)
         mock_sender.send_data.assert_called_once_with("test data")
 
+    @patch('configparser.ConfigParser.read')
+    @patch('functions.data_sender.DataSender')
+    def test_send_data_to_server_config_cached(self, mock_data_sender_class, mock_read):
+        """Test that the configuration file is parsed only once."""
+        with patch.dict(config_loader._config_cache, clear=True):
+            mock_data_sender_class.return_value.send_data.return_value = True
+            
+            send_data_to_server("first")
+            send_data_to_server("second")
+        
+        mock_read.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for logging_setup module.
+Tests the queue-based logging listener.
+"""
+
+import unittest
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions import logging_setup
+
+class TestLoggingSetup(unittest.TestCase):
+    """Test cases for the shared logging listener."""
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        root_logger = logging.getLogger()
+        saved_handlers = root_logger.handlers[:]
+        saved_level = root_logger.level
+        
+        def restore_root_logger():
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
+        self.addCleanup(restore_root_logger)
+        self.addCleanup(logging_setup.stop_logging)
+        
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.log_file = os.path.join(temp_dir.name, 'client.log')
+    
+    def test_setup_logging_writes_file(self):
+        """Test that records reach the log file through the listener."""
+        logging_setup.setup_logging(self.log_file, logging.INFO, console_output=False)
+        
+        root_handlers = logging.getLogger().handlers
+        self.assertEqual(len(root_handlers), 1)
+        self.assertIsInstance(root_handlers[0], logging.handlers.QueueHandler)
+        
+        logging.info("queued message")
+        logging_setup.stop_logging()
+        
+        with open(self.log_file) as f:
+            self.assertIn("INFO - queued message", f.read())
+    
+    def test_setup_logging_keeps_application_handlers(self):
+        """Test that only the implicit basicConfig() handler is replaced."""
+        root_logger = logging.getLogger()
+        root_logger.handlers[:] = []
+        logging.basicConfig()
+        implicit_handler = root_logger.handlers[0]
+        application_handler = logging.NullHandler()
+        root_logger.addHandler(application_handler)
+        
+        logging_setup.setup_logging(self.log_file, console_output=False)
+        
+        self.assertNotIn(implicit_handler, root_logger.handlers)
+        self.assertIn(application_handler, root_logger.handlers)
+    
+    def test_stop_logging_detaches_queue_handler(self):
+        """Test that no queue handler is left behind once the listener stops."""
+        logging_setup.setup_logging(self.log_file, console_output=False)
+        logging_setup.stop_logging()
+        
+        self.assertFalse([handler for handler in logging.getLogger().handlers
+                          if isinstance(handler, logging.handlers.QueueHandler)])
+    
+    def test_setup_logging_once(self):
+        """Test that later calls reuse the running listener."""
+        listener = logging_setup.setup_logging(self.log_file, console_output=False)
+        
+        self.assertIs(logging_setup.setup_logging(self.log_file), listener)
+        self.assertEqual(len(listener.handlers), 1)
+
+if __name__ == '__main__':
+    unittest.main()
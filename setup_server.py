@@ -7,7 +7,7 @@ import sys
 
 # Dependencies are automatically detected, but it might be fine tuned.
 build_exe_options = {
-    "packages": ["socket", "threading", "logging", "configparser", "os", "signal", "sys", "datetime"],
+    "packages": ["socket", "selectors", "asyncio", "multiprocessing", "concurrent.futures", "logging", "queue", "configparser", "os", "signal", "struct", "datetime"],
     "excludes": ["tkinter", "unittest", "pydoc", "doctest", "argparse"],
     "include_files": ["server_config.ini"]
 }
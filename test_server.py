@@ -4,27 +4,70 @@ Tests the server script and related functions.
 """
 
 import unittest
+import asyncio
 import socket
+import signal
 import threading
-import time
 import configparser
+import gc
+import logging
+import multiprocessing
 import os
-import sys
+import selectors
+import struct
+import tempfile
+import time
+import tracemalloc
+import warnings
 from unittest.mock import Mock, patch, MagicMock
 
-# Add current directory to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 # Import server functions
 import Server
 
+# Per-connection INFO records are not asserted on; skip formatting them
+logging.getLogger('Server').setLevel(logging.WARNING)
+# Importing Server no longer configures logging; keep the errors the tests
+# provoke on purpose off stderr
+logging.getLogger('Server').addHandler(logging.NullHandler())
+
+def _tune(sock):
+    """Disable Nagle's algorithm and enlarge the kernel buffers of a test socket."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+
+# Every acknowledgment starts with this prefix
+ACK_PREFIX = b"Server received: "
+
+def frame(payload):
+    """Prefix an encoded message with the server's 4-byte length header."""
+    return struct.pack('>I', len(payload)) + payload
+
+class FaultySocket:
+    """Wrap a real socket so that chosen methods raise instead of running."""
+    
+    def __init__(self, sock, **errors):
+        self._sock = sock
+        self._errors = errors
+        self.failed = []
+    
+    def __getattr__(self, name):
+        if name not in self._errors:
+            return getattr(self._sock, name)
+        
+        def fail(*args, **kwargs):
+            self.failed.append(name)
+            raise self._errors[name]
+        return fail
+
 class TestServerFunctions(unittest.TestCase):
     """Test cases for server functions."""
     
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.test_config = configparser.ConfigParser()
-        self.test_config['SERVER'] = {
+    @classmethod
+    def setUpClass(cls):
+        """Set up read-only test fixtures once for the whole class."""
+        cls.test_config = configparser.ConfigParser()
+        cls.test_config['SERVER'] = {
             'HOST': '127.0.0.1',
             'PORT': '12346',  # Use different port for testing
             'MAX_CONNECTIONS': '5',
@@ -35,186 +78,620 @@ class TestServerFunctions(unittest.TestCase):
         """Test signal handler function."""
         # Test that signal handler sets server_running to False
         Server.server_running = True
+        self.addCleanup(setattr, Server, 'server_running', True)
         Server.signal_handler(signal.SIGINT, None)
         self.assertFalse(Server.server_running)
     
-    @patch('socket.socket')
-    def test_handle_client_success(self, mock_socket_class):
-        """Test successful client handling."""
-        # Create mock client socket
-        mock_client_socket = Mock()
-        mock_client_socket.getpeername.return_value = ('127.0.0.1', 12345)
-        mock_client_socket.recv.side_effect = [b"test message", b""]  # Second call returns empty (disconnect)
+    def test_run_threaded_closes_queued_clients(self):
+        """Test that clients still queued for a worker thread are closed on shutdown."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(listener.close)
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(16)
         
-        # Test the function
-        Server.handle_client(mock_client_socket, ('127.0.0.1', 12345))
+        release = threading.Event()
+        self.addCleanup(release.set)
+        accepted = threading.Semaphore(0)
         
-        # Verify socket operations
-        self.assertEqual(mock_client_socket.recv.call_count, 2)
-        mock_client_socket.sendall.assert_called_once()
-        mock_client_socket.close.assert_called_once()
+        def busy_handler(client_socket, client_address, stop_event):
+            # Keep every worker thread occupied until the test ends
+            release.wait(5)
+            client_socket.close()
+        
+        stop = threading.Event()
+        # Four worker threads, so the last two of six clients stay queued
+        with patch.object(Server, 'MAX_CONNECTIONS', 1), \
+                patch.object(Server, 'POLL_INTERVAL', 0.1), \
+                patch.object(Server, 'handle_client', busy_handler), \
+                patch.object(Server, '_tune_client_socket', lambda sock: accepted.release()):
+            server_thread = threading.Thread(target=Server.run_threaded, args=(listener, stop), daemon=True)
+            server_thread.start()
+            
+            clients = []
+            for _ in range(6):
+                client = socket.create_connection(listener.getsockname(), timeout=2)
+                self.addCleanup(client.close)
+                clients.append(client)
+            for _ in range(6):
+                self.assertTrue(accepted.acquire(timeout=2))
+            
+            # Dropped sockets would otherwise be closed by the garbage collector
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always', ResourceWarning)
+                stop.set()
+                server_thread.join(timeout=2)
+                gc.collect()
+        
+        self.assertFalse(server_thread.is_alive())
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [])
+        for client in clients[4:]:
+            self.assertEqual(client.recv(1), b"")
+        # Clients being served are left to their handlers
+        clients[0].settimeout(0.1)
+        with self.assertRaises(socket.timeout):
+            clients[0].recv(1)
     
-    @patch('socket.socket')
-    def test_handle_client_socket_error(self, mock_socket_class):
-        """Test client handling with socket error."""
-        mock_client_socket = Mock()
-        mock_client_socket.getpeername.return_value = ('127.0.0.1', 12345)
-        mock_client_socket.recv.side_effect = socket.error("Connection lost")
+    # name, socket methods that raise, expected reply
+    HANDLE_CLIENT_CASES = [
+        ("success", {}, ACK_PREFIX + b"test message"),
+        ("socket_error", {'recv_into': socket.error("Connection lost")}, b""),
+        ("general_error", {'recv_into': Exception("Unexpected error")}, b""),
+        ("send_error", {'sendmsg': Exception("Send failed")}, b""),
+        ("close_error", {'close': Exception("Close failed")}, ACK_PREFIX + b"test message"),
+    ]
+    
+    def test_handle_client(self):
+        """Test client handling for successful and failing connections."""
+        for name, errors, expected_reply in self.HANDLE_CLIENT_CASES:
+            with self.subTest(name):
+                server_end, client_end = socket.socketpair()
+                self.addCleanup(server_end.close)
+                self.addCleanup(client_end.close)
+                client_end.settimeout(5)
+                
+                # One message, then end of stream
+                client_end.sendall(frame(b"test message"))
+                client_end.shutdown(socket.SHUT_WR)
+                
+                # Errors are handled inside and must not propagate
+                client_socket = FaultySocket(server_end, **errors)
+                Server.handle_client(client_socket, ('local', 0))
+                
+                if 'close' in errors:
+                    self.assertEqual(client_socket.failed, ['close'])
+                    server_end.close()
+                else:
+                    # The connection is closed in every other case
+                    self.assertEqual(server_end.fileno(), -1)
+                
+                reply = b""
+                try:
+                    while True:
+                        chunk = client_end.recv(4096)
+                        if not chunk:
+                            break
+                        reply += chunk
+                except ConnectionResetError:
+                    # Closing with unread data resets the connection
+                    pass
+                self.assertEqual(reply, expected_reply)
+    
+    def test_handle_client_large_message_memory(self):
+        """Test that an oversized body is buffered as it arrives, not at its announced size."""
+        server_end, client_end = socket.socketpair()
+        self.addCleanup(server_end.close)
+        self.addCleanup(client_end.close)
+        
+        # Announce the largest allowed message, then send only part of it
+        client_end.sendall(Server.MESSAGE_HEADER.pack(Server.MAX_MESSAGE_SIZE) + b"x" * 1000)
+        client_end.shutdown(socket.SHUT_WR)
+        
+        tracemalloc.start()
+        try:
+            Server.handle_client(server_end, ('local', 0))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, Server.MAX_MESSAGE_SIZE // 4)
         
-        # Test the function
-        Server.handle_client(mock_client_socket, ('127.0.0.1', 12345))
+        # A complete message several times the buffer size still arrives intact
+        server_end, client_end = socket.socketpair()
+        self.addCleanup(server_end.close)
+        self.addCleanup(client_end.close)
+        message = bytes(range(256)) * 200
+        client_end.sendall(message)
+        self.assertEqual(bytes(Server._recv_large(server_end, len(message), 4096)), message)
+    
+    def test_receive_log_rate_limit(self):
+        """Test that per-message receive records are rate limited and summarized."""
+        now = [100.0]
+        with patch.object(Server, 'RECEIVE_LOG_RATE', 2), \
+                patch.object(Server, '_receive_log_window', 0.0), \
+                patch.object(Server, '_receive_log_count', 0), \
+                patch.object(Server, '_receive_log_dropped', 0), \
+                patch.object(Server.time, 'monotonic', lambda: now[0]), \
+                self.assertLogs('Server', level='INFO') as logs:
+            for i in range(5):
+                Server._log_received(('local', 0), b"message %d" % i)
+            
+            # The next window reports what the previous one suppressed
+            now[0] += 1.0
+            Server._log_received(('local', 0), b"message 5")
         
-        # Verify socket was closed
-        mock_client_socket.close.assert_called_once()
+        self.assertEqual([record.getMessage() for record in logs.records], [
+            "Received from local:0: message 0",
+            "Received from local:0: message 1",
+            "Suppressed 3 receive log records",
+            "Received from local:0: message 5",
+        ])
     
-    @patch('socket.socket')
-    def test_handle_client_general_error(self, mock_socket_class):
-        """Test client handling with general error."""
-        mock_client_socket = Mock()
-        mock_client_socket.getpeername.return_value = ('127.0.0.1', 12345)
-        mock_client_socket.recv.side_effect = Exception("Unexpected error")
+    def test_handle_client_looks_up_peer(self):
+        """Test that the peer address is looked up once when none is given."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(listener.close)
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
         
-        # Test the function
-        Server.handle_client(mock_client_socket, ('127.0.0.1', 12345))
+        client_end = socket.create_connection(listener.getsockname(), timeout=5)
+        self.addCleanup(client_end.close)
+        server_end, client_address = listener.accept()
+        self.addCleanup(server_end.close)
         
-        # Verify socket was closed
-        mock_client_socket.close.assert_called_once()
+        client_end.sendall(frame(b"test message"))
+        client_end.shutdown(socket.SHUT_WR)
+        
+        with patch.object(Server, '_log_received') as mock_log_received:
+            Server.handle_client(server_end, None)
+        
+        mock_log_received.assert_called_once()
+        self.assertEqual(mock_log_received.call_args[0][0], client_address)
+        self.assertEqual(client_end.recv(4096), ACK_PREFIX + b"test message")
     
-    @patch('socket.socket')
-    def test_handle_client_send_error(self, mock_socket_class):
-        """Test client handling with send error."""
-        mock_client_socket = Mock()
-        mock_client_socket.getpeername.return_value = ('127.0.0.1', 12345)
-        mock_client_socket.recv.return_value = b"test message"
-        mock_client_socket.sendall.side_effect = Exception("Send failed")
+    def test_reactor_backpressure(self):
+        """Test that the reactor stops reading from a client that does not read its acknowledgments."""
+        server_end, client_end = socket.socketpair()
+        self.addCleanup(server_end.close)
+        self.addCleanup(client_end.close)
+        server_end.setblocking(False)
         
-        # Test the function
-        Server.handle_client(mock_client_socket, ('127.0.0.1', 12345))
+        sel = selectors.DefaultSelector()
+        self.addCleanup(sel.close)
+        state = Server._new_connection_state(('local', 0))
+        sel.register(server_end, selectors.EVENT_READ, state)
         
-        # Verify socket was closed despite send error
-        mock_client_socket.close.assert_called_once()
+        with patch.object(Server, 'SEND_HIGH_WATER', 32 * 1024), \
+                patch.object(Server, 'SEND_LOW_WATER', 8 * 1024):
+            # Pipeline messages without reading any acknowledgment
+            client_end.sendall(frame(b"x" * 1000) * 64)
+            while sel.get_key(server_end).events & selectors.EVENT_READ:
+                self.assertTrue(Server._on_read(sel, sel.get_key(server_end)))
+            
+            self.assertEqual(sel.get_key(server_end).events, selectors.EVENT_WRITE)
+            self.assertLess(len(state['send_buffer']), 32 * 1024 + Server.RECV_BUFFER_SIZE * 2)
+            
+            # Reading resumes once the client drains the backlog
+            client_end.setblocking(False)
+            while not sel.get_key(server_end).events & selectors.EVENT_READ:
+                Server._on_write(sel, sel.get_key(server_end))
+                try:
+                    while client_end.recv(65536):
+                        pass
+                except BlockingIOError:
+                    pass
+            self.assertLess(len(state['send_buffer']), 8 * 1024)
     
-    @patch('socket.socket')
-    def test_handle_client_close_error(self, mock_socket_class):
-        """Test client handling with close error."""
+    def test_reactor_grows_buffer_as_data_arrives(self):
+        """Test that the reactor does not allocate a large message's announced size up front."""
+        server_end, client_end = socket.socketpair()
+        self.addCleanup(server_end.close)
+        self.addCleanup(client_end.close)
+        server_end.setblocking(False)
+        
+        sel = selectors.DefaultSelector()
+        self.addCleanup(sel.close)
+        state = Server._new_connection_state(('local', 0))
+        sel.register(server_end, selectors.EVENT_READ, state)
+        
+        # Announce the largest allowed message but send only part of it
+        client_end.sendall(Server.MESSAGE_HEADER.pack(Server.MAX_MESSAGE_SIZE))
+        client_end.sendall(b"x" * Server.RECV_BUFFER_SIZE)
+        while state['recv_length'] < Server.RECV_BUFFER_SIZE + Server.MESSAGE_HEADER.size:
+            self.assertTrue(Server._on_read(sel, sel.get_key(server_end)))
+        
+        self.assertLessEqual(len(state['recv_buffer']), Server.RECV_BUFFER_SIZE * 4)
+        self.assertFalse(state['send_buffer'])
+    
+    def test_sendmsg_all_partial_writes(self):
+        """Test that partially accepted scatter-gather writes are resumed."""
         mock_client_socket = Mock()
-        mock_client_socket.getpeername.return_value = ('127.0.0.1', 12345)
-        mock_client_socket.recv.side_effect = [b"test message", b""]
-        mock_client_socket.close.side_effect = Exception("Close failed")
+        sent = []
+        
+        def sendmsg(buffers):
+            data = b"".join(bytes(buffer) for buffer in buffers)[:5]
+            sent.append(data)
+            return len(data)
+        mock_client_socket.sendmsg.side_effect = sendmsg
         
-        # Test the function - should not raise exception
-        Server.handle_client(mock_client_socket, ('127.0.0.1', 12345))
+        Server._sendmsg_all(mock_client_socket, [ACK_PREFIX, b"test message"])
         
-        # Verify close was attempted
-        mock_client_socket.close.assert_called_once()
+        self.assertEqual(b"".join(sent), ACK_PREFIX + b"test message")
+    
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), "SO_REUSEPORT not supported")
+    def test_run_asyncio_private_loop(self):
+        """Test that the asyncio backend runs uvloop without changing the event loop policy."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        stop_event = threading.Event()
+        stop_event.set()
+        
+        fake_uvloop = Mock()
+        fake_uvloop.new_event_loop.side_effect = asyncio.new_event_loop
+        policy = asyncio.get_event_loop_policy()
+        with patch.object(Server, 'uvloop', fake_uvloop):
+            Server.run_asyncio(server, stop_event)
+        
+        fake_uvloop.new_event_loop.assert_called_once()
+        self.assertIs(asyncio.get_event_loop_policy(), policy)
+    
+    def test_create_server_socket_reuse_port(self):
+        """Test that worker listeners are created with SO_REUSEPORT."""
+        with patch.object(Server, 'HOST', '127.0.0.1'), patch.object(Server, 'PORT', 0):
+            server = Server.create_server_socket(reuse_port=True)
+        
+        try:
+            self.assertTrue(server.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT))
+        finally:
+            server.close()
 
 class TestServerIntegration(unittest.TestCase):
     """Integration tests for server functionality."""
     
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.test_port = 12347  # Use different port for testing
-        self.server_thread = None
-        self.server_socket = None
+        # Let the OS pick a free port so test runs never collide
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(('127.0.0.1', 0))
+        self.test_port = probe.getsockname()[1]
+        probe.close()
+        # Stops this test's serving loops without touching Server.server_running
+        self._stop = threading.Event()
+        self.server_threads = []
+        self.server_sockets = []
+        # Listeners whose serving loop may sleep in accept() or select()
+        self.wake_sockets = []
+        self.clients = []
     
     def tearDown(self):
         """Clean up after each test."""
-        if self.server_socket:
+        for client in self.clients:
+            client.close()
+        # Stop the serving loops before closing the sockets they are watching
+        self._stop.set()
+        # Wake loops blocked in accept() instead of waiting for their timeout
+        for server_socket in self.wake_sockets:
             try:
-                self.server_socket.close()
-            except:
+                server_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
                 pass
+        for server_thread in self.server_threads:
+            server_thread.join(timeout=Server.POLL_INTERVAL * 3)
         
-        if self.server_thread and self.server_thread.is_alive():
-            Server.server_running = False
-            self.server_thread.join(timeout=1)
+        for server_socket in self.server_sockets:
+            try:
+                server_socket.close()
+            except:
+                pass
     
     def start_test_server(self):
-        """Start a test server in a separate thread."""
-        def run_server():
-            try:
-                self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                self.server_socket.bind(('127.0.0.1', self.test_port))
-                self.server_socket.listen(1)
-                Server.server_running = True
-                
-                while Server.server_running:
-                    try:
-                        client_socket, addr = self.server_socket.accept()
-                        Server.handle_client(client_socket, addr)
-                    except socket.error:
-                        break
-            except Exception as e:
-                print(f"Server error: {e}")
-            finally:
-                if self.server_socket:
-                    self.server_socket.close()
-        
-        self.server_thread = threading.Thread(target=run_server, daemon=True)
-        self.server_thread.start()
-        time.sleep(0.1)  # Give server time to start
+        """Start one Server.run_reactor thread per CPU, each with its own SO_REUSEPORT listener."""
+        if hasattr(os, 'sched_getaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(os.cpu_count() or 1))
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            # Without SO_REUSEPORT only one listener can bind the port
+            cpus = cpus[:1]
+        
+        def run_server(cpu, server_socket):
+            if hasattr(os, 'sched_setaffinity'):
+                # Keep this acceptor and its connections on one core
+                os.sched_setaffinity(0, {cpu})
+            # One thread multiplexes the listener and every client
+            Server.run_reactor(server_socket, self._stop)
+        
+        for cpu in cpus:
+            # Listen before the thread starts, so clients can connect right away
+            server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            _tune(server_socket)
+            self.server_sockets.append(server_socket)
+            self.wake_sockets.append(server_socket)
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, 'SO_REUSEPORT'):
+                server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            server_socket.bind(('127.0.0.1', self.test_port))
+            server_socket.listen(128)
+            
+            server_thread = threading.Thread(target=run_server, args=(cpu, server_socket), daemon=True)
+            server_thread.start()
+            self.server_threads.append(server_thread)
+    
+    def _connect_clients(self, n, quickack=False):
+        """
+        Connect several tuned clients to the test server; tearDown closes them.
+        
+        Args:
+            n (int): Number of clients
+            quickack (bool): Acknowledge the server's replies without delay
+            
+        Returns:
+            list: Connected client sockets
+        """
+        clients = []
+        for _ in range(n):
+            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.clients.append(client_socket)
+            _tune(client_socket)
+            client_socket.settimeout(5)
+            client_socket.connect(('127.0.0.1', self.test_port))
+            if quickack:
+                Server._rearm_quickack(client_socket)
+            clients.append(client_socket)
+        return clients
+    
+    def _assert_echo(self, client, payload, quickack=False):
+        """
+        Receive one acknowledgment and check that it echoes the payload.
+        Reads exactly its length, so pipelined acknowledgments can be checked one by one.
+        
+        Args:
+            client: Connected client socket
+            payload (bytes): Message body the server should echo
+            quickack (bool): Acknowledge the server's reply without delay
+        """
+        expected = ACK_PREFIX + payload
+        response = bytearray()
+        while len(response) < len(expected):
+            chunk = client.recv(len(expected) - len(response))
+            if quickack:
+                Server._rearm_quickack(client)
+            if not chunk:
+                break
+            response += chunk
+        self.assertEqual(bytes(response), expected)
+    
+    def start_backend(self, serve, wake=True):
+        """
+        Run one of the server's serving loops on a test socket in a separate thread.
+        
+        Args:
+            serve: Serving loop taking the listening socket and a stop event
+            wake: Shut the listener down in tearDown to wake a loop sleeping in
+                accept() or select(). asyncio retries accept() on a shut-down
+                listener in a tight loop, so its loop must not be woken this way.
+        """
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        _tune(server_socket)
+        self.server_sockets.append(server_socket)
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_socket.bind(('127.0.0.1', self.test_port))
+        # Room for every test client, so no SYN is dropped and retried a second later
+        server_socket.listen(64)
+        if wake:
+            self.wake_sockets.append(server_socket)
+        
+        server_thread = threading.Thread(target=serve, args=(server_socket, self._stop), daemon=True)
+        server_thread.start()
+        self.server_threads.append(server_thread)
     
     def test_client_server_communication(self):
         """Test basic client-server communication."""
-        # Start test server
         self.start_test_server()
+        # Acknowledge the server's reply immediately instead of delaying the ACK
+        (client,) = self._connect_clients(1, quickack=True)
+        
+        test_message = "Hello from test client".encode('ascii')
+        client.sendall(frame(test_message))
+        self._assert_echo(client, test_message, quickack=True)
+    
+    def test_multiple_clients(self):
+        """Test server handling multiple clients."""
+        self.start_test_server()
+        clients = self._connect_clients(3, quickack=True)
+        
+        # Send messages from all clients before waiting for any reply
+        payloads = [f"Message from client {i}".encode('ascii') for i in range(len(clients))]
+        for client, payload in zip(clients, payloads):
+            client.sendall(frame(payload))
+        
+        # Then collect every acknowledgment
+        for client, payload in zip(clients, payloads):
+            self._assert_echo(client, payload, quickack=True)
+    
+    def test_handle_file_request(self):
+        """Test sending a file's contents to a client with sendfile."""
+        content = os.urandom(256 * 1024)
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_sockets.append(server_socket)
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_socket.bind(('127.0.0.1', self.test_port))
+        server_socket.listen(1)
+        
+        def serve_file():
+            connection, _ = server_socket.accept()
+            with connection:
+                # Reactor clients are non-blocking and must be refused
+                connection.setblocking(False)
+                with self.assertRaises(ValueError):
+                    Server.handle_file_request(connection, f.name)
+                connection.setblocking(True)
+                self.missing = Server.handle_file_request(connection, f.name + ".missing")
+                self.sent = Server.handle_file_request(connection, f.name)
+        
+        server_thread = threading.Thread(target=serve_file, daemon=True)
+        server_thread.start()
+        self.server_threads.append(server_thread)
         
-        # Create client and connect
         client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        _tune(client_socket)
         client_socket.settimeout(5)
-        
         try:
             client_socket.connect(('127.0.0.1', self.test_port))
-            
-            # Send test message
-            test_message = "Hello from test client"
-            client_socket.sendall(test_message.encode('utf-8'))
-            
-            # Receive acknowledgment
-            response = client_socket.recv(1024)
-            self.assertIsNotNone(response)
-            self.assertIn(b"Server received", response)
-            
+            received = b""
+            while True:
+                chunk = client_socket.recv(65536)
+                if not chunk:
+                    break
+                received += chunk
         finally:
             client_socket.close()
-            Server.server_running = False
+        
+        server_thread.join(timeout=5)
+        self.assertEqual(received, content)
+        self.assertEqual(self.sent, len(content))
+        self.assertIsNone(self.missing)
     
-    def test_multiple_clients(self):
-        """Test server handling multiple clients."""
-        # Start test server
-        self.start_test_server()
+    def test_reactor_multiple_clients(self):
+        """Test the selector-based reactor serving several clients at once."""
+        self.start_backend(Server.run_reactor)
+        clients = self._connect_clients(3)
         
-        clients = []
-        try:
-            # Create multiple clients
-            for i in range(3):
-                client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                client_socket.settimeout(5)
-                client_socket.connect(('127.0.0.1', self.test_port))
-                clients.append(client_socket)
+        # All clients stay connected while each one is served
+        for i, client in enumerate(clients):
+            payload = f"Message from client {i}".encode('ascii')
+            client.sendall(frame(payload))
+            self._assert_echo(client, payload)
+        
+        # Pipelined messages arriving in one segment are acknowledged in order
+        clients[0].sendall(frame(b"first") + frame(b"second")[:5])
+        clients[0].sendall(frame(b"second")[5:])
+        self._assert_echo(clients[0], b"first")
+        self._assert_echo(clients[0], b"second")
+        
+        # Messages larger than the receive buffer still arrive intact
+        large_message = b"x" * (Server.RECV_BUFFER_SIZE * 2)
+        clients[1].sendall(frame(large_message))
+        self._assert_echo(clients[1], large_message)
+        
+        # Clients that half-close right after sending still get every acknowledgment
+        closing = self._connect_clients(20)
+        for client in closing:
+            client.sendall(frame(b"one") + frame(b"two"))
+            client.shutdown(socket.SHUT_WR)
+        for client in closing:
+            self._assert_echo(client, b"one")
+            self._assert_echo(client, b"two")
+            self.assertEqual(client.recv(1), b"")
+    
+    def test_asyncio_multiple_clients(self):
+        """Test the asyncio backend serving several clients at once."""
+        self.start_backend(Server.run_asyncio, wake=False)
+        clients = self._connect_clients(3)
+        
+        for i, client in enumerate(clients):
+            payload = f"Message from client {i}".encode('ascii')
+            client.sendall(frame(payload))
+            self._assert_echo(client, payload)
+        
+        # Every client pipelines a burst before any acknowledgment is read
+        payloads = [[f"Message {j} from client {i}".encode('ascii') for j in range(20)]
+                    for i in range(len(clients))]
+        for client, burst in zip(clients, payloads):
+            client.sendall(b"".join(frame(payload) for payload in burst))
+        for client, burst in zip(clients, payloads):
+            for payload in burst:
+                self._assert_echo(client, payload)
+    
+    def test_asyncio_stops_with_connected_clients(self):
+        """Test that the asyncio backend shuts down while a client is still connected."""
+        with patch.object(Server, 'POLL_INTERVAL', 0.1):
+            self.start_backend(Server.run_asyncio, wake=False)
+            (client,) = self._connect_clients(1)
+            client.sendall(frame(b"hello"))
+            self._assert_echo(client, b"hello")
             
-            # Send messages from all clients
-            for i, client in enumerate(clients):
-                message = f"Message from client {i}"
-                client.sendall(message.encode('utf-8'))
-                
-                # Receive acknowledgment
-                response = client.recv(1024)
-                self.assertIsNotNone(response)
-                self.assertIn(b"Server received", response)
+            # The loop reports exceptions in its callbacks through the asyncio logger
+            with patch.object(logging.getLogger('asyncio'), 'error') as asyncio_error:
+                self._stop.set()
+                self.server_threads[0].join(timeout=2)
+        
+        self.assertFalse(self.server_threads[0].is_alive())
+        asyncio_error.assert_not_called()
+        # The idle client's connection was closed
+        self.assertEqual(client.recv(1), b"")
+    
+    def test_threaded_multiple_clients(self):
+        """Test the thread-pool fallback serving several clients at once."""
+        self.start_backend(Server.run_threaded)
+        clients = self._connect_clients(3)
+        
+        for i, client in enumerate(clients):
+            payload = f"Message from client {i}".encode('ascii')
+            client.sendall(frame(payload))
+            self._assert_echo(client, payload)
+        
+        # Messages larger than the reusable receive buffer still arrive intact
+        large_message = b"x" * (Server.BUFFER_SIZE * 2)
+        clients[0].sendall(frame(large_message))
+        self._assert_echo(clients[0], large_message)
+
+    @unittest.skipUnless(Server.USE_REUSEPORT and multiprocessing.get_start_method() == 'fork',
+                         "Workers need SO_REUSEPORT and must inherit the patched settings")
+    def test_run_workers(self):
+        """Test that SO_REUSEPORT worker processes serve clients on a shared port."""
+        for patcher in (patch.object(Server, 'HOST', '127.0.0.1'),
+                        patch.object(Server, 'PORT', self.test_port),
+                        patch.object(Server, 'POLL_INTERVAL', 0.1)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        runner = threading.Thread(target=Server.run_workers, args=(2,), daemon=True)
+        runner.start()
+        try:
+            # Wait for a worker to start listening
+            deadline = time.monotonic() + 5
+            while True:
+                try:
+                    (client,) = self._connect_clients(1)
+                    break
+                except ConnectionRefusedError:
+                    self.assertLess(time.monotonic(), deadline, "Workers did not start")
+                    time.sleep(0.05)
             
+            client.sendall(frame(b"worker message"))
+            self._assert_echo(client, b"worker message")
         finally:
-            for client in clients:
-                client.close()
             Server.server_running = False
+            runner.join(timeout=5)
+            Server.server_running = True
+        self.assertFalse(runner.is_alive())
+
+    @unittest.skipUnless(Server.USE_REUSEPORT and multiprocessing.get_start_method() == 'fork',
+                         "Workers must inherit the patched worker entry point")
+    def test_run_workers_terminates_stuck_workers(self):
+        """Test that workers ignoring the stop event are terminated on shutdown."""
+        def stuck_worker(index, stop_event):
+            time.sleep(60)
+        
+        with patch.object(Server, 'POLL_INTERVAL', 0.1), \
+                patch.object(Server, '_serve_worker', stuck_worker), \
+                patch.object(Server, 'server_running', False), \
+                self.assertLogs('Server', level='INFO') as logs:
+            Server.run_workers(2)
+        
+        self.assertEqual(multiprocessing.active_children(), [])
+        self.assertIn("All workers stopped", logs.records[-1].getMessage())
 
 class TestServerConfiguration(unittest.TestCase):
     """Test cases for server configuration handling."""
     
     def test_config_loading(self):
-        """Test configuration loading from file."""
-        # Create temporary config file
+        """Test configuration loading from a string."""
         config_content = """
 [SERVER]
 HOST = 127.0.0.1
@@ -222,23 +699,13 @@ PORT = 12348
 MAX_CONNECTIONS = 10
 BUFFER_SIZE = 2048
 """
-        with open('test_server_config.ini', 'w') as f:
-            f.write(config_content)
+        config = configparser.ConfigParser()
+        config.read_string(config_content)
         
-        try:
-            # Test config loading
-            config = configparser.ConfigParser()
-            config.read('test_server_config.ini')
-            
-            self.assertEqual(config.get('SERVER', 'HOST'), '127.0.0.1')
-            self.assertEqual(config.get('SERVER', 'PORT'), '12348')
-            self.assertEqual(config.get('SERVER', 'MAX_CONNECTIONS'), '10')
-            self.assertEqual(config.get('SERVER', 'BUFFER_SIZE'), '2048')
-            
-        finally:
-            # Clean up
-            if os.path.exists('test_server_config.ini'):
-                os.remove('test_server_config.ini')
+        self.assertEqual(config.get('SERVER', 'HOST'), '127.0.0.1')
+        self.assertEqual(config.get('SERVER', 'PORT'), '12348')
+        self.assertEqual(config.get('SERVER', 'MAX_CONNECTIONS'), '10')
+        self.assertEqual(config.get('SERVER', 'BUFFER_SIZE'), '2048')
     
     def test_config_defaults(self):
         """Test configuration with default values."""
@@ -248,12 +715,12 @@ BUFFER_SIZE = 2048
         host = config.get('SERVER', 'HOST', fallback='0.0.0.0')
         port = int(config.get('SERVER', 'PORT', fallback='12345'))
         max_conn = int(config.get('SERVER', 'MAX_CONNECTIONS', fallback='5'))
-        buffer_size = int(config.get('SERVER', 'BUFFER_SIZE', fallback='1024'))
+        buffer_size = int(config.get('SERVER', 'BUFFER_SIZE', fallback='65536'))
         
         self.assertEqual(host, '0.0.0.0')
         self.assertEqual(port, 12345)
         self.assertEqual(max_conn, 5)
-        self.assertEqual(buffer_size, 1024)
+        self.assertEqual(buffer_size, 65536)
 
 if __name__ == '__main__':
     unittest.main()